@@ -1,6 +1,6 @@
 import { defineStore } from 'pinia';
 import { ref, computed } from 'vue';
-import { socketEvents } from '../features/system/services/socketio';
+import { socketEvents, sendMessage } from '../features/system/services/socketio';
 
 // Define interface for Renogy data
 export interface RenogyData {
@@ -29,10 +29,12 @@ export interface RenogyData {
   power_generation_total?: number;
   charger_status?: string;
 
-  // Dynamic properties
+  // Per-cell and per-sensor readings, index = cell/sensor number
   cell_count?: number;
   sensor_count?: number;
-  [key: string]: any; // For dynamic properties like cell_voltage_0, temperature_0, etc.
+  cell_voltages?: number[];
+  temperatures?: number[];
+  [key: string]: any;
 }
 
 export const useRenogyStore = defineStore('renogy', () => {
@@ -153,6 +155,11 @@ export const useRenogyStore = defineStore('renogy', () => {
     isInitialized.value = true;
   };
 
+  // Ask for fresh values now rather than waiting for the next poll; they arrive with the next data update
+  const refresh = (device: string, fields?: string[], maxAge = 0) => {
+    sendMessage('renogy_refresh', { device, fields, max_age: maxAge });
+  };
+
   // Cleanup when component unmounts
   const cleanup = () => {
     socketEvents.off('connected', handleConnectionChange);
@@ -186,6 +193,7 @@ export const useRenogyStore = defineStore('renogy', () => {
 
     // Socket.IO methods
     init,
+    refresh,
     cleanup
   };
 });
\ No newline at end of file
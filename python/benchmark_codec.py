@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the frame codec: response CRC checks, command encoding and frame reassembly throughput.
+Frames come from the simulator's register maps, so no hardware is needed.
+"""
+
+import argparse
+import random
+import timeit
+
+from renogybt.codec import crc_valid, read_command, write_multiple_command
+from renogybt.framing import FrameAssembler
+from renogybt.simulator import SimulatedPeripheral, rover_registers, battery_registers
+from renogybt.utils import crc16_modbus, ModbusFunction
+
+def read_response(registers, register, words):
+    """Build the response frame a device would send for a read"""
+    request = read_command(255, register, words)
+    return bytearray(SimulatedPeripheral('00:00:00:00:00:00', 'bench', registers).handle_request(request))
+
+def legacy_crc_valid(view):
+    """FrameAssembler's CRC check before the codec: recompute over a slice and compare the tail"""
+    return crc16_modbus(view[:-2]) == view[-2:]
+
+def legacy_read_command(device_id, register, word_count):
+    """Device._create_read_command before the codec, rebuilt on every poll"""
+    cmd = [device_id, ModbusFunction.READ, register >> 8, register & 0xFF, word_count >> 8, word_count & 0xFF]
+    crc = crc16_modbus(bytes(cmd))
+    cmd.append(crc[0])
+    cmd.append(crc[1])
+    return bytearray(cmd)
+
+def legacy_write_multiple_command(device_id, register, values):
+    """Device._create_write_multiple_command before the codec"""
+    cmd = bytearray([device_id, ModbusFunction.WRITE_MULTIPLE, register >> 8, register & 0xFF,
+                     len(values) >> 8, len(values) & 0xFF, len(values) * 2])
+    for value in values:
+        cmd += (value & 0xFFFF).to_bytes(2, 'big')
+    cmd += crc16_modbus(bytes(cmd))
+    return cmd
+
+def bench(name, legacy, codec, number, size=None):
+    """Time both implementations and print the per-call cost"""
+    legacy_time = timeit.timeit(legacy, number=number) / number
+    codec_time = timeit.timeit(codec, number=number) / number
+    throughput = f"   {size / codec_time / 1e6:5.2f} MB/s" if size else ''
+    print(f"{name:<18} legacy {legacy_time * 1e6:7.2f} µs   codec {codec_time * 1e6:7.2f} µs   "
+          f"{legacy_time / codec_time:4.1f}x{throughput}")
+
+def notifications(frames, mtu, corrupt_rate):
+    """Split frames into notification-sized chunks, flipping a byte in some frames"""
+    rng = random.Random(1)
+    chunks = []
+    for frame in frames:
+        frame = bytearray(frame)
+        if rng.random() < corrupt_rate:
+            frame[rng.randrange(3, len(frame))] ^= 0xFF
+        chunks.extend(bytes(frame[i:i + mtu]) for i in range(0, len(frame), mtu))
+    return chunks
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark the Renogy frame codec')
+    parser.add_argument('-n', '--number', type=int, default=100000,
+                        help='Calls per measurement (default: 100000)')
+    parser.add_argument('--frames', type=int, default=20000,
+                        help='Frames pushed through the assembler (default: 20000)')
+    parser.add_argument('--mtu', type=int, default=20, help='Notification size in bytes (default: 20)')
+    parser.add_argument('--corrupt', type=float, default=0.01,
+                        help='Fraction of frames with a flipped byte (default: 0.01)')
+    args = parser.parse_args()
+
+    charging_frame = read_response(rover_registers(), 256, 34)
+    cells_frame = read_response(battery_registers(), 5000, 34)
+    values = list(range(8))
+
+    # Both implementations must agree before their speed means anything
+    for frame in (charging_frame, cells_frame):
+        assert crc_valid(memoryview(frame)) and legacy_crc_valid(memoryview(frame))
+    assert read_command(255, 256, 34) == legacy_read_command(255, 256, 34)
+    assert write_multiple_command(255, 57348, values) == legacy_write_multiple_command(255, 57348, values)
+
+    for name, frame in (('charging CRC', charging_frame), ('cells CRC', cells_frame)):
+        view = memoryview(frame)
+        bench(name, lambda: legacy_crc_valid(view), lambda: crc_valid(view), args.number, len(frame))
+    bench('read command', lambda: legacy_read_command(255, 256, 34),
+          lambda: read_command(255, 256, 34), args.number)
+    bench('write multiple', lambda: legacy_write_multiple_command(255, 57348, values),
+          lambda: write_multiple_command(255, 57348, values), args.number)
+
+    # Reassembly of fragmented notifications with the occasional corrupted frame
+    chunks = notifications([charging_frame, cells_frame] * (args.frames // 2), args.mtu, args.corrupt)
+    size = sum(len(chunk) for chunk in chunks)
+    assembler = FrameAssembler(stale_timeout=float('inf'))
+
+    def reassemble():
+        for chunk in chunks:
+            assembler.feed(chunk)
+
+    elapsed = timeit.timeit(reassemble, number=1)
+    stats = assembler.stats()
+    print(f"{'reassembly':<18} {len(chunks)} notifications, {stats['frames']} frames in {elapsed * 1000:.1f} ms   "
+          f"{stats['frames'] / elapsed:,.0f} frames/s   {size / elapsed / 1e6:5.2f} MB/s   "
+          f"{stats['crc_errors']} CRC errors, {stats['resyncs']} resyncs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark the register-map decoders against the per-field bytes_to_int parsers they replaced.
+Frames come from the simulator's register maps, so no hardware is needed.
+"""
+
+import argparse
+import timeit
+
+from renogybt.battery import BATTERY_INFO
+from renogybt.rover import CHARGING_INFO
+from renogybt.simulator import SimulatedPeripheral, rover_registers, battery_registers
+from renogybt.snapshots import RoverSnapshot, BatterySnapshot
+from renogybt.utils import bytes_to_int, crc16_modbus, parse_temperature, CHARGING_STATES, LOAD_STATES
+
+def read_response(registers, register, words):
+    """Build the response frame a device would send for a read"""
+    request = bytearray([255, 3, register >> 8, register & 0xFF, words >> 8, words & 0xFF])
+    request += crc16_modbus(request)
+    return bytearray(SimulatedPeripheral('00:00:00:00:00:00', 'bench', registers).handle_request(request))
+
+def legacy_charging_info(data, unit='C'):
+    """RoverDevice.parse_charging_info before register maps"""
+    result = {}
+    result['battery_percentage'] = bytes_to_int(data, 3, 2)
+    result['battery_voltage'] = bytes_to_int(data, 5, 2, scale=0.1)
+    result['battery_current'] = bytes_to_int(data, 7, 2, scale=0.01)
+    result['battery_temperature'] = parse_temperature(bytes_to_int(data, 10, 1), unit)
+    result['controller_temperature'] = parse_temperature(bytes_to_int(data, 9, 1), unit)
+    result['charging_status'] = CHARGING_STATES.get(bytes_to_int(data, 68, 1), 'unknown')
+    result['load_status'] = LOAD_STATES.get(bytes_to_int(data, 67, 1) >> 7, 'unknown')
+    result['load_voltage'] = bytes_to_int(data, 11, 2, scale=0.1)
+    result['load_current'] = bytes_to_int(data, 13, 2, scale=0.01)
+    result['load_power'] = bytes_to_int(data, 15, 2)
+    result['pv_voltage'] = bytes_to_int(data, 17, 2, scale=0.1)
+    result['pv_current'] = bytes_to_int(data, 19, 2, scale=0.01)
+    result['pv_power'] = bytes_to_int(data, 21, 2)
+    result['max_charging_power_today'] = bytes_to_int(data, 33, 2)
+    result['max_discharging_power_today'] = bytes_to_int(data, 35, 2)
+    result['charging_amp_hours_today'] = bytes_to_int(data, 37, 2)
+    result['discharging_amp_hours_today'] = bytes_to_int(data, 39, 2)
+    result['power_generation_today'] = bytes_to_int(data, 41, 2)
+    result['power_consumption_today'] = bytes_to_int(data, 43, 2)
+    result['power_generation_total'] = bytes_to_int(data, 59, 4)
+    return result
+
+def legacy_battery_info(data):
+    """BatteryDevice.parse_battery_info field decoding before register maps"""
+    return {
+        'current': bytes_to_int(data, 3, 2, signed=True, scale=0.01),
+        'voltage': bytes_to_int(data, 5, 2, scale=0.1),
+        'remaining_charge': bytes_to_int(data, 7, 4, scale=0.001),
+        'capacity': bytes_to_int(data, 11, 4, scale=0.001)
+    }
+
+def bench(name, legacy, compiled, number):
+    """Time both decoders and print the per-frame cost"""
+    legacy_time = timeit.timeit(legacy, number=number) / number
+    compiled_time = timeit.timeit(compiled, number=number) / number
+    print(f"{name:<14} legacy {legacy_time * 1e6:7.2f} µs   register map {compiled_time * 1e6:7.2f} µs   "
+          f"{legacy_time / compiled_time:4.1f}x")
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark Renogy frame decoders')
+    parser.add_argument('-n', '--number', type=int, default=100000,
+                        help='Frames decoded per measurement (default: 100000)')
+    args = parser.parse_args()
+
+    charging_frame = read_response(rover_registers(), 256, 34)
+    battery_frame = read_response(battery_registers(), 5042, 6)
+
+    # Both decoders must agree before their speed means anything
+    assert CHARGING_INFO.decode(charging_frame) == legacy_charging_info(charging_frame)
+    assert BATTERY_INFO.decode(battery_frame) == legacy_battery_info(battery_frame)
+
+    rover = RoverSnapshot()
+    battery = BatterySnapshot()
+    bench('charging info', lambda: legacy_charging_info(charging_frame),
+          lambda: CHARGING_INFO.decode_into(charging_frame, rover), args.number)
+    bench('battery info', lambda: legacy_battery_info(battery_frame),
+          lambda: BATTERY_INFO.decode_into(battery_frame, battery), args.number)
+
+if __name__ == "__main__":
+    main()
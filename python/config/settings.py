@@ -1,12 +1,15 @@
 # Configuration settings for the application
 
 # Renogy device configurations
+# 'adapter' is an hciN name, or 'auto' to spread devices across all available adapters
+# 'max_in_flight' is the most Modbus reads outstanding at once; raise it only as far as the device firmware tolerates
 DCDC_CONFIG = {
     'adapter': 'hci0',
     'type': 'rng_ctrl',
     'mac_addr': 'F9A78286-C476-FAFA-B979-8A15259A1768',
     'alias': 'BT-TH-1619141A',
-    'device_id': 255
+    'device_id': 255,
+    'max_in_flight': 1
 }
 
 BATTERY_CONFIG = {
@@ -14,12 +17,48 @@ BATTERY_CONFIG = {
     'type': 'rng_batt',
     'mac_addr': '7BD4C7F0-B018-68EA-BBAD-7D21D527310D',
     'alias': 'BT-TH-9B26D2DC',
-    'device_id': 255
+    'device_id': 255,
+    'max_in_flight': 1
 }
 
 # Renogy
-POLL_INTERVAL = 5  # seconds - increased from 5s to reduce Raspberry Pi BLE load
+POLL_INTERVAL = 5  # seconds - default max age of live register sections
+POLL_AIRTIME_BUDGET = 0.5  # largest fraction of time a device link spends on poll reads
 TEMPERATURE_UNIT = 'C'
+MODBUS_RESPONSE_TIMEOUT = 3  # seconds to wait for a reply to a read
+MODBUS_LATE_RESPONSE_GRACE = 2  # seconds a timed-out read's size stays reserved for its late reply
+MODBUS_MAX_READ_WORDS = 40  # largest merged read, in 16-bit words
+MODBUS_MAX_READ_GAP = 2  # unused words allowed between sections merged into one read
+SLOW_REFRESH_INTERVAL = 300  # seconds between reads of slowly changing sections
+RECONNECT_BASE_DELAY = 2  # seconds - first reconnect backoff, doubled (with jitter) per failure
+RECONNECT_MAX_DELAY = 30  # seconds - cap on the reconnect backoff
+RECONNECT_CIRCUIT_THRESHOLD = 5  # consecutive failures before the circuit opens
+RECONNECT_OPEN_CIRCUIT_DELAY = 120  # seconds between probes while the circuit is open
+LINK_STATS_INTERVAL = 10  # seconds between renogy:link_stats events
+HANDLER_SLOW_THRESHOLD = 2  # seconds a DeviceManager data or error handler may run before it is logged as slow
+HANDLER_QUEUE_SIZE = 32  # device events waiting for each DeviceManager handler, oldest dropped beyond this
+DATA_HEARTBEAT_INTERVAL = 60  # seconds - report device data at least this often even when flat
+# Smallest change worth reporting, matched against data field names (e.g. 'voltage' covers 'cell_voltages')
+DATA_DEADBANDS = {
+    'voltage': 0.05,  # V
+    'current': 0.05,  # A
+    'temperature': 0.5,  # degrees
+    'power': 1.0  # W
+}
+NOTIFY_QUEUE_SIZE = 64  # frames waiting per device between the BLE notification callback and frame handling
+NOTIFY_QUEUE_OVERFLOW = 'drop_oldest'  # or 'drop_newest', which frame to drop when the queue is full
+RENOGY_TRANSPORT = 'bleak'  # 'simulator' to run against in-process simulated devices
+RENOGY_FRAME_CAPTURE = False  # record raw BLE traffic per device to FRAME_CAPTURE_DIR for offline replay
+
+# Simulated devices (RENOGY_TRANSPORT = 'simulator')
+SIMULATOR_CONFIG = {
+    'latency': 0.08,  # seconds from request to first notification
+    'jitter': 0.04,  # seconds of random extra latency
+    'mtu': 20,  # bytes per notification, larger frames are fragmented
+    'drop_rate': 0.0,  # probability a notification is lost
+    'disconnect_rate': 0.0  # probability a request drops the link
+}
+BLE_MAX_CONCURRENT_CONNECTIONS = 2  # per adapter - BlueZ handles a couple of parallel connects well
 
 # WiFi favorites
 WIFI_FAVORITES = [
@@ -36,6 +75,8 @@ import os
 # Get the directory of the current script
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 APP_DIR = os.path.join(PROJECT_ROOT, 'app')
+GATT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'defender-os', 'gatt_cache.json')
+FRAME_CAPTURE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'defender-os', 'captures')
 
 # Server settings
 DEBUG = True
@@ -0,0 +1,65 @@
+"""
+Controller for Renogy device endpoints
+"""
+import logging
+import math
+from quart import Blueprint, current_app, jsonify, request
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger(__name__)
+
+# Create Blueprint for renogy routes
+renogy_bp = Blueprint('renogy', __name__)
+
+def parse_refresh_request(data):
+    """
+    Validate a refresh request from HTTP or Socket.IO
+
+    Args:
+        data: Request body with 'device', optional 'fields' and optional 'max_age'
+
+    Returns:
+        tuple: (device_key, fields, max_age)
+
+    Raises:
+        ValueError: If any argument is missing or malformed
+    """
+    if not isinstance(data, dict):
+        raise ValueError('request body must be an object')
+
+    device_key = data.get('device')
+    if not device_key or not isinstance(device_key, str):
+        raise ValueError('device is required')
+
+    fields = data.get('fields')
+    if fields is not None and (not isinstance(fields, list) or not all(isinstance(f, str) for f in fields)):
+        raise ValueError('fields must be a list of field names')
+
+    max_age = data.get('max_age')
+    if max_age is None:
+        max_age = 0.0
+    elif isinstance(max_age, bool) or not isinstance(max_age, (int, float)) or not math.isfinite(max_age) or max_age < 0:
+        raise ValueError('max_age must be a non-negative number of seconds')
+
+    return device_key, fields, float(max_age)
+
+@renogy_bp.route('/renogy/refresh', methods=['POST'])
+async def refresh():
+    """Read device fields now instead of waiting for the next poll"""
+    data = await request.get_json(silent=True)
+
+    try:
+        device_key, fields, max_age = parse_refresh_request(data if data is not None else {})
+        values = await current_app.renogy_service.refresh(device_key, fields, max_age)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    return jsonify({
+        'success': True,
+        'device': device_key,
+        'data': values
+    })
@@ -8,6 +8,8 @@ import asyncio
 from quart import Blueprint
 import time
 
+from controllers.renogy_controller import parse_refresh_request
+
 # Configure logging
 logging.basicConfig(level=logging.WARNING)
 log = logging.getLogger(__name__)
@@ -31,6 +33,9 @@ sio_bp = Blueprint('socketio', __name__)
 # Store client connection information
 connected_clients = {}
 
+# Renogy service for on-demand reads, set by the app at startup
+renogy_service = None
+
 # Store last known state for each data type to send to new connections
 last_state = {
     'renogy': None,
@@ -94,7 +99,23 @@ async def system_request_update(sid, data):
     log.info(f"System update requested by client: {sid}")
     await start_system_update()
 
-async def emit_event(event_type, event_name, data):
+@sio.event
+async def renogy_refresh(sid, data):
+    """Handle on-demand Renogy reads, replying to the requesting client only"""
+    device_key = data.get('device') if isinstance(data, dict) else None
+
+    if renogy_service is None:
+        await sio.emit('renogy:refresh', {'device': device_key, 'error': 'Renogy service not started'}, room=sid)
+        return
+
+    try:
+        device_key, fields, max_age = parse_refresh_request(data or {})
+        values = await renogy_service.refresh(device_key, fields, max_age)
+        await sio.emit('renogy:refresh', {'device': device_key, 'data': values}, room=sid)
+    except ValueError as e:
+        await sio.emit('renogy:refresh', {'device': device_key, 'error': str(e)}, room=sid)
+
+async def emit_event(event_type, event_name, data, update_state=True):
     """
     Emit an event to all connected clients
 
@@ -102,9 +123,11 @@ async def emit_event(event_type, event_name, data):
         event_type (str): Type of event (e.g., 'renogy', 'gpio')
         event_name (str): Name of the event (e.g., 'data_update')
         data (dict): Data to send
+        update_state (bool): Store data as the initial state for new clients
     """
     # Update last known state
-    update_last_state(event_type, data)
+    if update_state:
+        update_last_state(event_type, data)
 
     # Log active connections before broadcasting
     active_clients = len(connected_clients)
@@ -116,6 +139,11 @@ async def emit_event(event_type, event_name, data):
     except Exception as e:
         log.error(f"Error emitting {event_type}:{event_name}: {str(e)}")
 
+def set_renogy_service(service):
+    """Provide the Renogy service that serves refresh requests"""
+    global renogy_service
+    renogy_service = service
+
 def update_last_state(state_type, data):
     """Update the last known state for a specific event type"""
     last_state[state_type] = data
@@ -7,8 +7,9 @@ from quart import Quart, jsonify
 import socketio
 from controllers.system_controller import system_bp
 from controllers.gpio_controller import gpio_bp, monitor_reverse_light, is_reversing
-from controllers.socketio_controller import sio, sio_bp, update_last_state, emit_event
+from controllers.socketio_controller import sio, sio_bp, update_last_state, emit_event, set_renogy_service
 from controllers.wifi_controller import wifi_bp, monitor_wifi_status
+from controllers.renogy_controller import renogy_bp
 from utils.middleware import add_cors_headers
 from utils.colored_logging import setup_colored_logging
 from services.renogy_service import RenogyService
@@ -29,6 +30,7 @@ app.register_blueprint(system_bp)
 app.register_blueprint(gpio_bp)
 app.register_blueprint(sio_bp)
 app.register_blueprint(wifi_bp)
+app.register_blueprint(renogy_bp)
 
 # Add CORS middleware
 app.after_request(add_cors_headers)
@@ -46,6 +48,7 @@ async def before_serving():
 
     # Add renogy_service to app context for access in other parts of the application
     app.renogy_service = renogy_service
+    set_renogy_service(renogy_service)
 
     # Initialize the GPIO state in the Socket.IO controller
     update_last_state('gpio', {'is_reversing': is_reversing})
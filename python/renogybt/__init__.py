@@ -8,12 +8,31 @@ from .utils import bytes_to_int, crc16_modbus
 from .rover import RoverDevice
 from .battery import BatteryDevice
 from .lipo_model import LipoModel
+from .scanner import BleScanner
+from .command_queue import Priority
+from .read_plan import Refresh
+from .snapshots import RoverSnapshot, BatterySnapshot
+from .register_map import Field, RegisterMap
+from .exceptions import (RenogyError, TransactionError, TransactionTimeoutError, ModbusExceptionError,
+                         WriteVerificationError)
 __all__ = [
     'Device',
     'DeviceManager',
     'RoverDevice',
     'BatteryDevice',
     'LipoModel',
+    'BleScanner',
+    'Priority',
+    'Refresh',
+    'RoverSnapshot',
+    'BatterySnapshot',
+    'Field',
+    'RegisterMap',
+    'RenogyError',
+    'TransactionError',
+    'TransactionTimeoutError',
+    'ModbusExceptionError',
+    'WriteVerificationError',
     'bytes_to_int',
     'crc16_modbus'
 ]
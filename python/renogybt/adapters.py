@@ -0,0 +1,72 @@
+"""
+Bluetooth adapter discovery and assignment for Renogy devices
+"""
+
+import logging
+import os
+import re
+from typing import Dict, List, Optional
+
+# Adapter setting that spreads devices across all available adapters
+ADAPTER_AUTO = 'auto'
+
+SYSFS_BLUETOOTH_PATH = '/sys/class/bluetooth'
+ADAPTER_NAME_PATTERN = re.compile(r'^hci\d+$')
+
+# Number of devices assigned to each adapter
+_assignments: Dict[str, int] = {}
+
+def list_adapters() -> List[str]:
+    """
+    List the local Bluetooth adapters
+
+    Returns:
+        list: Adapter names such as 'hci0', sorted by index
+    """
+    try:
+        names = [name for name in os.listdir(SYSFS_BLUETOOTH_PATH) if ADAPTER_NAME_PATTERN.match(name)]
+    except OSError:
+        return []
+
+    return sorted(names, key=lambda name: int(name[3:]))
+
+def assign_adapter(requested: Optional[str]) -> Optional[str]:
+    """
+    Assign a device to an adapter
+
+    Args:
+        requested: Adapter name, 'auto' to pick the least used adapter,
+            or None for the system default
+
+    Returns:
+        str adapter name, or None to use the system default adapter
+    """
+    if not requested:
+        return None
+
+    if requested == ADAPTER_AUTO:
+        available = list_adapters()
+        if not available:
+            logging.warning("⚠️ No Bluetooth adapters found, using the default adapter")
+            return None
+
+        # Spread devices evenly, lowest index first on a tie
+        adapter = min(available, key=lambda name: _assignments.get(name, 0))
+    else:
+        adapter = requested
+        available = list_adapters()
+        if available and adapter not in available:
+            logging.warning(f"⚠️ Adapter {adapter} not found (available: {', '.join(available)})")
+
+    _assignments[adapter] = _assignments.get(adapter, 0) + 1
+    logging.info(f"📶 Assigned adapter {adapter}")
+    return adapter
+
+def get_assignments() -> Dict[str, int]:
+    """
+    Get the number of devices assigned to each adapter
+
+    Returns:
+        dict: Adapter name to device count
+    """
+    return dict(_assignments)
@@ -3,17 +3,38 @@ Simplified client for Renogy LFP batteries with Bluetooth
 """
 
 import logging
+from array import array
 from typing import Dict, Any, Optional
 
 from .device import Device
+from .read_plan import Refresh
+from .register_map import Field, RegisterMap, word_array
+from .snapshots import BatterySnapshot
 from .utils import bytes_to_int, parse_temperature
 from config.settings import TEMPERATURE_UNIT
 
+# Register 5042 block: current, voltage, remaining charge and capacity
+BATTERY_INFO = RegisterMap([
+    Field('current', 3, signed=True, scale=0.01),
+    Field('voltage', 5, scale=0.1),
+    Field('remaining_charge', 7, width=4, scale=0.001),
+    Field('capacity', 11, width=4, scale=0.001)
+])
+
+DEVICE_ADDRESS = RegisterMap([Field('device_id', 3)])
+
+# Fields filled by the cell voltage and temperature sections, including the statistics derived from them
+CELL_VOLTAGE_FIELDS = ('cell_voltages', 'cell_count', 'min_cell_voltage', 'max_cell_voltage',
+                       'avg_cell_voltage', 'cell_voltage_diff')
+TEMPERATURE_FIELDS = ('temperatures', 'sensor_count', 'min_temperature', 'max_temperature', 'avg_temperature')
+
 class BatteryDevice(Device):
     """
     Specialized device implementation for Renogy LFP batteries
     """
 
+    snapshot_class = BatterySnapshot
+
     def __init__(self, mac_address: str, name: str = None, device_id: int = 1, **kwargs):
         """
         Initialize a battery device
@@ -27,11 +48,16 @@ class BatteryDevice(Device):
         self.temperature_unit = TEMPERATURE_UNIT
 
         # Define register sections to poll
-        self.add_section(register=5000, word_count=17, parser=self.parse_cell_volt_info)
-        self.add_section(register=5017, word_count=17, parser=self.parse_cell_temp_info)
-        self.add_section(register=5042, word_count=6, parser=self.parse_battery_info)
-        self.add_section(register=5122, word_count=8, parser=self.parse_device_info)
-        self.add_section(register=5223, word_count=1, parser=self.parse_device_address)
+        self.add_section(register=5000, word_count=17, parser=self.parse_cell_volt_info, max_age=15,
+                         fields=CELL_VOLTAGE_FIELDS)
+        self.add_section(register=5017, word_count=17, parser=self.parse_cell_temp_info, max_age=15,
+                         fields=TEMPERATURE_FIELDS)
+        self.add_section(register=5042, word_count=6, parser=self.parse_battery_info, max_age=3,
+                         fields=BATTERY_INFO.names + ('soc_percent', 'power', 'status'))
+        self.add_section(register=5122, word_count=8, parser=self.parse_device_info, refresh=Refresh.ONCE,
+                         fields=('model',))
+        self.add_section(register=5223, word_count=1, parser=self.parse_device_address, refresh=Refresh.ONCE,
+                         fields=DEVICE_ADDRESS.names)
 
     def parse_cell_volt_info(self, data: bytearray) -> None:
         """
@@ -42,19 +68,10 @@ class BatteryDevice(Device):
         """
         try:
             cell_count = bytes_to_int(data, 3, 2)
-            self.data['cell_count'] = cell_count
 
             # Parse individual cell voltages
-            for i in range(0, cell_count):
-                self.data[f'cell_voltage_{i}'] = bytes_to_int(data, 5 + i*2, 2, scale=0.1)
-
-            # Calculate min/max/avg cell voltages for convenience
-            cell_voltages = [self.data[f'cell_voltage_{i}'] for i in range(cell_count)]
-            if cell_voltages:
-                self.data['min_cell_voltage'] = min(cell_voltages)
-                self.data['max_cell_voltage'] = max(cell_voltages)
-                self.data['avg_cell_voltage'] = sum(cell_voltages) / len(cell_voltages)
-                self.data['cell_voltage_diff'] = self.data['max_cell_voltage'] - self.data['min_cell_voltage']
+            raw = word_array(cell_count).unpack_from(data, 5)
+            self.data.cell_voltages = array('f', [value * 0.1 for value in raw])
 
         except Exception as e:
             logging.error(f"❌ Error parsing cell voltage info: {e}")
@@ -68,21 +85,15 @@ class BatteryDevice(Device):
         """
         try:
             sensor_count = bytes_to_int(data, 3, 2)
-            self.data['sensor_count'] = sensor_count
+            fahrenheit = self.temperature_unit.upper() != 'C'
 
             # Parse individual temperature sensors
-            temperatures = []
-            for i in range(0, sensor_count):
-                celsius = bytes_to_int(data, 5 + i*2, 2, scale=0.1, signed=True)
-                temp_value = celsius if self.temperature_unit.upper() == 'C' else (celsius * 9/5) + 32
-                self.data[f'temperature_{i}'] = temp_value
-                temperatures.append(temp_value)
-
-            # Calculate min/max/avg temperatures for convenience
-            if temperatures:
-                self.data['min_temperature'] = min(temperatures)
-                self.data['max_temperature'] = max(temperatures)
-                self.data['avg_temperature'] = sum(temperatures) / len(temperatures)
+            raw = word_array(sensor_count, signed=True).unpack_from(data, 5)
+            if fahrenheit:
+                temperatures = array('f', [value * 0.1 * 9/5 + 32 for value in raw])
+            else:
+                temperatures = array('f', [value * 0.1 for value in raw])
+            self.data.temperatures = temperatures
 
         except Exception as e:
             logging.error(f"❌ Error parsing temperature info: {e}")
@@ -96,27 +107,25 @@ class BatteryDevice(Device):
         """
         try:
             # Basic battery metrics
-            self.data['current'] = bytes_to_int(data, 3, 2, signed=True, scale=0.01)
-            self.data['voltage'] = bytes_to_int(data, 5, 2, scale=0.1)
-            self.data['remaining_charge'] = bytes_to_int(data, 7, 4, scale=0.001)
-            self.data['capacity'] = bytes_to_int(data, 11, 4, scale=0.001)
+            snapshot = self.data
+            BATTERY_INFO.decode_into(data, snapshot)
 
             # Calculate derived metrics
-            if self.data.get('capacity', 0) > 0:
-                self.data['soc_percent'] = min(100, round((self.data['remaining_charge'] / self.data['capacity']) * 100, 1))
+            if snapshot.capacity > 0:
+                snapshot.soc_percent = min(100, round((snapshot.remaining_charge / snapshot.capacity) * 100, 1))
             else:
-                self.data['soc_percent'] = 0
+                snapshot.soc_percent = 0
 
             # Calculate power (watts)
-            self.data['power'] = round(self.data['voltage'] * self.data['current'], 2)
+            snapshot.power = round(snapshot.voltage * snapshot.current, 2)
 
             # Determine if charging or discharging
-            if self.data['current'] > 0:
-                self.data['status'] = 'charging'
-            elif self.data['current'] < 0:
-                self.data['status'] = 'discharging'
+            if snapshot.current > 0:
+                snapshot.status = 'charging'
+            elif snapshot.current < 0:
+                snapshot.status = 'discharging'
             else:
-                self.data['status'] = 'idle'
+                snapshot.status = 'idle'
 
         except Exception as e:
             logging.error(f"❌ Error parsing battery info: {e}")
@@ -131,7 +140,7 @@ class BatteryDevice(Device):
         try:
             # Extract model name from bytes 3-19, strip null characters
             model = data[3:19].decode('utf-8').rstrip('\x00')
-            self.data['model'] = model
+            self.data.model = model
         except Exception as e:
             logging.error(f"❌ Error parsing device info: {e}")
 
@@ -143,7 +152,7 @@ class BatteryDevice(Device):
             data: Raw response data
         """
         try:
-            self.data['device_id'] = bytes_to_int(data, 3, 2)
+            DEVICE_ADDRESS.decode_into(data, self.data)
         except Exception as e:
             logging.error(f"❌ Error parsing device address: {e}")
 
@@ -163,8 +172,9 @@ class BatteryDevice(Device):
             'min_cell_voltage', 'max_cell_voltage', 'cell_voltage_diff',
             'min_temperature', 'max_temperature'
         ]:
-            if key in self.data:
-                summary[key] = self.data[key]
+            value = getattr(self.data, key)
+            if value is not None:
+                summary[key] = value
 
         return summary
 
@@ -175,15 +185,7 @@ class BatteryDevice(Device):
         Returns:
             dict: Dictionary of cell index to voltage
         """
-        result = {}
-        cell_count = self.data.get('cell_count', 0)
-
-        for i in range(cell_count):
-            key = f'cell_voltage_{i}'
-            if key in self.data:
-                result[i] = self.data[key]
-
-        return result
+        return dict(enumerate(self.data.cell_voltage_list()))
 
     def get_temperatures(self) -> Dict[int, float]:
         """
@@ -192,12 +194,4 @@ class BatteryDevice(Device):
         Returns:
             dict: Dictionary of sensor index to temperature
         """
-        result = {}
-        sensor_count = self.data.get('sensor_count', 0)
-
-        for i in range(sensor_count):
-            key = f'temperature_{i}'
-            if key in self.data:
-                result[i] = self.data[key]
-
-        return result
\ No newline at end of file
+        return dict(enumerate(self.data.temperature_list()))
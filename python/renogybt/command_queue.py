@@ -0,0 +1,247 @@
+"""
+Priority command queue for requests sent over a BLE connection
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Set
+
+class Priority:
+    CONTROL = 0  # user-initiated writes, e.g. toggling the load
+    ON_DEMAND = 1  # reads someone is waiting on
+    POLL = 2  # background polling
+
+PRIORITY_NAMES = {
+    Priority.CONTROL: 'control',
+    Priority.ON_DEMAND: 'on_demand',
+    Priority.POLL: 'poll'
+}
+
+class Command:
+    """
+    A queued request, awaitable through its future
+    """
+
+    __slots__ = ('priority', 'sequence', 'name', 'operation', 'future', 'task', 'enqueued_at', 'started_at')
+
+    def __init__(self, priority: int, sequence: int, name: str, operation: Callable[[], Awaitable[Any]]):
+        self.priority = priority
+        self.sequence = sequence
+        self.name = name
+        self.operation = operation
+        self.future = asyncio.get_event_loop().create_future()
+        self.task = None
+        self.enqueued_at = time.monotonic()
+        self.started_at = None
+
+    def __lt__(self, other: 'Command') -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+    def cancel(self) -> bool:
+        """
+        Cancel the command, whether it is still queued or in flight
+
+        Returns:
+            bool: True if the command had not finished yet
+        """
+        if self.future.done():
+            return False
+        self.future.cancel()
+        return True
+
+class CommandQueue:
+    """
+    Runs up to a window of commands at a time, highest priority first and FIFO
+    within a priority, and tracks how long commands wait
+
+    The window grows by one after a run of successes, up to max_window, and
+    halves when a request times out (additive increase, multiplicative decrease).
+    """
+
+    WINDOW_GROWTH_SUCCESSES = 20  # successes in a row before the window grows
+
+    def __init__(self, name: str, max_window: int = 1):
+        """
+        Initialize the queue
+
+        Args:
+            name: Name of the connection for logging
+            max_window: Most commands in flight at once
+        """
+        self.name = name
+        self.max_window = max(1, max_window)
+        self.window = self.max_window
+        self.in_flight: Set[Command] = set()
+
+        self._heap = []
+        self._sequence = itertools.count()
+        self._worker = None
+        self._slot_freed = asyncio.Event()
+        self._successes = 0
+        self._window_decreases = 0
+        self._stats = {
+            priority: {'submitted': 0, 'started': 0, 'completed': 0, 'failed': 0, 'cancelled': 0,
+                       'wait_total': 0.0, 'wait_max': 0.0}
+            for priority in PRIORITY_NAMES
+        }
+
+    def submit(self, operation: Callable[[], Awaitable[Any]], priority: int = Priority.POLL,
+               name: str = None) -> Command:
+        """
+        Queue a command
+
+        Args:
+            operation: Coroutine function performing the request
+            priority: Priority class, lower runs first
+            name: Description for logging
+
+        Returns:
+            Command: Handle whose future resolves with the operation's result
+        """
+        command = Command(priority, next(self._sequence), name or 'command', operation)
+        command.future.add_done_callback(self._on_command_done)
+        heapq.heappush(self._heap, command)
+        self._stats[priority]['submitted'] += 1
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        return command
+
+    async def run(self, operation: Callable[[], Awaitable[Any]], priority: int = Priority.POLL,
+                  name: str = None) -> Any:
+        """
+        Queue a command and wait for its result
+
+        Cancelling the caller cancels the command.
+
+        Args:
+            operation: Coroutine function performing the request
+            priority: Priority class, lower runs first
+            name: Description for logging
+
+        Returns:
+            The operation's result
+        """
+        return await self.submit(operation, priority, name).future
+
+    def record_success(self) -> None:
+        """A request completed, growing the window after a run of successes"""
+        self._successes += 1
+        if self._successes >= self.WINDOW_GROWTH_SUCCESSES and self.window < self.max_window:
+            self.window += 1
+            self._successes = 0
+            logging.debug(f"📈 {self.name} in-flight window grew to {self.window}")
+
+    def record_timeout(self) -> None:
+        """A request timed out, halving the window"""
+        self._successes = 0
+        if self.window > 1:
+            self.window = max(1, self.window // 2)
+            self._window_decreases += 1
+            logging.info(f"📉 {self.name} in-flight window shrank to {self.window} after a timeout")
+
+    def cancel_all(self, priority: int = None) -> int:
+        """
+        Cancel queued commands that have not started
+
+        Args:
+            priority: Only cancel this priority class (default: all)
+
+        Returns:
+            int: Number of commands cancelled
+        """
+        cancelled = 0
+        for command in list(self._heap):
+            if (priority is None or command.priority == priority) and command.cancel():
+                cancelled += 1
+        return cancelled
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and per-priority counters
+
+        Returns:
+            dict: Depth, in-flight command and wait times in milliseconds
+        """
+        stats = {
+            'depth': sum(1 for command in self._heap if not command.future.done()),
+            'in_flight': sorted(command.name for command in self.in_flight),
+            'window': self.window,
+            'max_window': self.max_window,
+            'window_decreases': self._window_decreases
+        }
+
+        for priority, counters in self._stats.items():
+            started = counters['started']
+            stats[PRIORITY_NAMES[priority]] = {
+                'submitted': counters['submitted'],
+                'completed': counters['completed'],
+                'failed': counters['failed'],
+                'cancelled': counters['cancelled'],
+                'mean_wait_ms': round(counters['wait_total'] / started * 1000, 1) if started else None,
+                'max_wait_ms': round(counters['wait_max'] * 1000, 1)
+            }
+
+        return stats
+
+    async def _run(self) -> None:
+        """Worker that starts queued commands whenever the window has room"""
+        while self._heap:
+            if len(self.in_flight) >= self.window:
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+                continue
+
+            command = heapq.heappop(self._heap)
+            if command.future.done():
+                continue
+
+            command.started_at = time.monotonic()
+            waited = command.started_at - command.enqueued_at
+            counters = self._stats[command.priority]
+            counters['started'] += 1
+            counters['wait_total'] += waited
+            counters['wait_max'] = max(counters['wait_max'], waited)
+
+            self.in_flight.add(command)
+            command.task = asyncio.ensure_future(command.operation())
+            command.task.add_done_callback(lambda task, command=command: self._on_task_done(command, task))
+
+    def _on_task_done(self, command: Command, task: asyncio.Task) -> None:
+        """Pass an operation's outcome to its command and free its slot"""
+        self.in_flight.discard(command)
+        self._slot_freed.set()
+
+        # Cancelled commands are counted when their future is cancelled
+        if task.cancelled():
+            if not command.future.done():
+                command.future.cancel()
+            return
+
+        counters = self._stats[command.priority]
+        error = task.exception()
+        if error is None:
+            if not command.future.done():
+                command.future.set_result(task.result())
+            counters['completed'] += 1
+        else:
+            if not command.future.done():
+                command.future.set_exception(error)
+            counters['failed'] += 1
+
+    def _on_command_done(self, future: asyncio.Future) -> None:
+        """Stop the in-flight operation when its command is cancelled"""
+        if not future.cancelled():
+            return
+
+        for command in list(self.in_flight) + self._heap:
+            if command.future is future:
+                self._stats[command.priority]['cancelled'] += 1
+                if command.task and not command.task.done():
+                    logging.debug(f"🚫 Cancelling in-flight {command.name} on {self.name}")
+                    command.task.cancel()
+                break
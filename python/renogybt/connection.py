@@ -4,13 +4,23 @@ Simplified BLE connection handling for Renogy devices
 
 import asyncio
 import logging
-from bleak import BleakClient, BleakScanner
+import time
+
+from .adapters import assign_adapter
+from .command_queue import CommandQueue
+from .frame_log import Direction, FrameRecorder
+from .framing import FrameAssembler
+from .gatt_cache import get_gatt_cache
+from .link_state import ConnectionStateMachine
+from .notify_queue import NotificationQueue
+from .scanner import get_shared_scanner
+from .telemetry import LinkStats
+from .transport import get_transport
 
 # Default configuration
-DEFAULT_DISCOVERY_TIMEOUT = 10  # seconds
+DEFAULT_DISCOVERY_TIMEOUT = 4  # seconds, only spent on an advertisement cache miss
 DEFAULT_RETRY_ATTEMPTS = 3
-DEFAULT_RETRY_DELAY = 5  # seconds
-DEFAULT_MAX_RETRY_DELAY = 30  # seconds
+DEFAULT_WRITE_RETRY_DELAY = 0.25  # seconds
 
 # Default service UUIDs
 DEFAULT_WRITE_SERVICE_UUID = "0000ffd0-0000-1000-8000-00805f9b34fb"
@@ -25,7 +35,8 @@ class BleConnection:
     def __init__(self, mac_address, name, data_callback=None,
                  write_service_uuid=DEFAULT_WRITE_SERVICE_UUID,
                  notify_char_uuid=DEFAULT_NOTIFY_CHAR_UUID,
-                 write_char_uuid=DEFAULT_WRITE_CHAR_UUID):
+                 write_char_uuid=DEFAULT_WRITE_CHAR_UUID,
+                 adapter=None, max_in_flight=1):
         """
         Initialize a BLE connection
 
@@ -36,6 +47,8 @@ class BleConnection:
             write_service_uuid: UUID of the write service
             notify_char_uuid: UUID of the notify characteristic
             write_char_uuid: UUID of the write characteristic
+            adapter: Bluetooth adapter ('hci0', 'auto' or None for the default)
+            max_in_flight: Most requests outstanding at once
         """
         self.mac_address = mac_address.upper()
         self.name = name
@@ -43,20 +56,31 @@ class BleConnection:
         self.write_service_uuid = write_service_uuid
         self.notify_char_uuid = notify_char_uuid
         self.write_char_uuid = write_char_uuid
+        self.adapter = assign_adapter(adapter)
+        self.scanner = get_shared_scanner(self.adapter)
+        self.gatt_cache = get_gatt_cache()
 
         # Connection state
         self.device = None
         self.client = None
         self.write_char_handle = None
+        self.using_cached_handles = False
         self.is_connected = False
+        self.connected_at = None  # monotonic time the current connection was established
+        self.assembler = FrameAssembler()
+        self.link = ConnectionStateMachine(name)
+        self.stats = LinkStats()
+        self.queue = CommandQueue(name, max_in_flight)
+        self.recorder = None  # FrameRecorder while capturing traffic
+        self.notify_queue = NotificationQueue(name, self._dispatch_frame)
         self._connection_lock = asyncio.Lock()
 
     async def discover(self, timeout=DEFAULT_DISCOVERY_TIMEOUT):
         """
-        Discover the device
+        Discover the device using the shared scanner's advertisement cache
 
         Args:
-            timeout: Discovery timeout in seconds
+            timeout: Time in seconds to wait if the device is not cached
 
         Returns:
             bool: True if device was found
@@ -64,15 +88,13 @@ class BleConnection:
         logging.info(f"🔍 Discovering device: {self.name}")
 
         try:
-            discovered_devices = await BleakScanner.discover(timeout=timeout)
-
-            for device in discovered_devices:
-                # Match by MAC address (preferred) or name
-                if (device.address and device.address.upper() == self.mac_address or
-                   (device.name and device.name.strip() == self.name)):
-                    logging.info(f"✅ Found device: {device.name} ({device.address})")
-                    self.device = device
-                    return True
+            # Match by MAC address (preferred) or name
+            advertisement = await self.scanner.find(self.mac_address, self.name, timeout)
+
+            if advertisement:
+                logging.info(f"✅ Found device: {advertisement.name} ({advertisement.address})")
+                self.device = advertisement.device
+                return True
 
             logging.warning(f"❌ Device not found: {self.name}")
             return False
@@ -96,19 +118,25 @@ class BleConnection:
                 return True
 
             attempts = 0
-            retry_delay = DEFAULT_RETRY_DELAY
 
             while max_attempts == 0 or attempts < max_attempts:
+                # Back off between attempts, never after the last one, and never cut an open circuit short
+                if attempts > 0 or self.link.backing_off:
+                    await self.link.wait()
+                else:
+                    self.link.start_probe()
+                attempts += 1
+
                 # Discover device if needed
                 if not self.device and not await self.discover():
-                    attempts += 1
-                    await self._handle_connection_failure(
-                        f"Discovery failed (attempt {attempts}/{max_attempts})",
-                        retry_delay
-                    )
-                    retry_delay = min(retry_delay * 1.5, DEFAULT_MAX_RETRY_DELAY)
+                    self._handle_connection_failure(f"Discovery failed (attempt {attempts}/{max_attempts})")
                     continue
 
+                # Prefer the freshest advertisement if the scanner has one
+                advertisement = self.scanner.lookup(self.mac_address, self.name)
+                if advertisement:
+                    self.device = advertisement.device
+
                 # Try to connect
                 try:
                     logging.info(f"🔌 Connecting to {self.name}...")
@@ -118,62 +146,47 @@ class BleConnection:
                         await self._disconnect_client()
 
                     # Create new client and connect
-                    self.client = BleakClient(self.device)
+                    self.client = get_transport().create_client(
+                        self.device,
+                        disconnected_callback=self._on_disconnected,
+                        adapter=self.adapter
+                    )
                     await self.client.connect()
 
                     if not self.client.is_connected:
-                        attempts += 1
-                        await self._handle_connection_failure(
-                            f"Connection failed (attempt {attempts}/{max_attempts})",
-                            retry_delay
-                        )
-                        retry_delay = min(retry_delay * 1.5, DEFAULT_MAX_RETRY_DELAY)
+                        self._handle_connection_failure(f"Connection failed (attempt {attempts}/{max_attempts})")
                         continue
 
-                    # Wait for service discovery to complete
-                    await asyncio.sleep(1)
-
-                    # Setup notifications and find write characteristic
+                    # Setup notifications and find write characteristic,
+                    # straight from cached handles when we have them
+                    self.assembler.reset()
                     self.is_connected = True
-                    service_found = False
-
-                    for service in self.client.services:
-                        for char in service.characteristics:
-                            # Set up notification handler
-                            if char.uuid == self.notify_char_uuid:
-                                await self.client.start_notify(char, self._notification_handler)
-                                logging.info(f"📡 Subscribed to notifications: {char.uuid}")
-
-                            # Find write characteristic
-                            if char.uuid == self.write_char_uuid and service.uuid == self.write_service_uuid:
-                                self.write_char_handle = char.handle
-                                service_found = True
-                                logging.info(f"📝 Found write characteristic: {char.uuid}")
+                    service_found = await self._setup_from_cache() or await self._setup_from_services()
 
                     if not service_found:
                         self.is_connected = False
-                        attempts += 1
-                        await self._handle_connection_failure(
-                            "Service discovery failed - required characteristic not found",
-                            retry_delay
-                        )
-                        retry_delay = min(retry_delay * 1.5, DEFAULT_MAX_RETRY_DELAY)
+                        self._handle_connection_failure("Service discovery failed - required characteristic not found")
                         continue
 
+                    self.connected_at = time.monotonic()
+                    self.link.record_connected()
+                    self.stats.record_connect()
+                    self._sample_rssi()
                     logging.info(f"✅ Connected to {self.name}")
                     return True
 
                 except Exception as e:
-                    attempts += 1
-                    await self._handle_connection_failure(
-                        f"Connection error: {e} (attempt {attempts}/{max_attempts})",
-                        retry_delay
-                    )
-                    retry_delay = min(retry_delay * 1.5, DEFAULT_MAX_RETRY_DELAY)
+                    self._handle_connection_failure(f"Connection error: {e} (attempt {attempts}/{max_attempts})")
 
             logging.error(f"❌ Failed to connect to {self.name} after {attempts} attempts")
             return False
 
+    @property
+    def is_ready(self):
+        """Whether the link is up with its characteristics resolved, so writes can go out"""
+        return (self.is_connected and self.client is not None and self.client.is_connected
+                and self.write_char_handle is not None)
+
     async def ensure_connected(self, max_attempts=2):
         """
         Ensure the device is connected, reconnecting if necessary
@@ -207,40 +220,49 @@ class BleConnection:
         Returns:
             bool: True if write was successful
         """
-        if not await self.ensure_connected():
+        # Fail fast while the link is down, reconnecting is left to the device's polling loop
+        if not self.is_ready:
+            logging.debug(f"📵 {self.name} not connected, dropping write")
             return False
 
         retry_count = 0
 
+        data = bytearray(data) if not isinstance(data, (bytes, bytearray)) else data
+
         while retry_count <= max_retries:
             try:
-                await self.client.write_gatt_char(
-                    self.write_char_handle,
-                    bytearray(data) if not isinstance(data, bytearray) else data,
-                    response=False
-                )
+                await self.client.write_gatt_char(self.write_char_handle, data, response=False)
+                if self.recorder:
+                    self.recorder.record(Direction.TX, data)
                 return True
 
             except Exception as e:
                 retry_count += 1
                 error_msg = str(e)
+                self.link.record_poll(False, f"write error: {e}")
+                self.stats.record_write_failure()
 
-                # Service discovery error requires reconnection
-                if "Service Discovery" in error_msg:
-                    logging.warning(f"⚙️ Service discovery error on write, attempt {retry_count}/{max_retries}")
+                # A cached handle that fails may be stale, resolve it again next time
+                if self.using_cached_handles:
+                    self.gatt_cache.invalidate(self.mac_address)
+                    self.using_cached_handles = False
 
-                    if retry_count <= max_retries:
-                        await self.disconnect()
-                        if await self.connect(1):  # Try once to reconnect
-                            continue
+                # Service discovery error requires reconnection, which the polling loop paces through the link
+                if "Service Discovery" in error_msg:
+                    logging.warning(f"⚙️ Service discovery error writing to {self.name}, dropping the link")
+                    await self._disconnect_client()
+                    self.is_connected = False
+                    self.link.record_disconnect(f"service discovery error: {e}")
+                    return False
 
                 if retry_count > max_retries:
                     logging.error(f"❌ Write failed after {max_retries} attempts: {e}")
                     self.is_connected = False
+                    self.link.record_disconnect(f"write failed: {e}")
                     return False
 
-                # Wait before retrying
-                await asyncio.sleep(1)
+                # Brief pause before retrying, reconnect pacing is left to the link state machine
+                await asyncio.sleep(DEFAULT_WRITE_RETRY_DELAY)
 
     async def disconnect(self):
         """
@@ -259,18 +281,154 @@ class BleConnection:
         self.is_connected = False
         self.client = None
         self.write_char_handle = None
+        self.using_cached_handles = False
+        await self.notify_queue.stop()
+        self.link.record_closed()
+        return True
+
+    async def _setup_from_cache(self):
+        """
+        Subscribe and resolve the write handle from the GATT cache
+
+        Returns:
+            bool: True if the cached handles were valid and set up
+        """
+        entry = self.gatt_cache.get(self.mac_address)
+        if not entry:
+            return False
+
+        try:
+            notify_char = self.client.services.get_characteristic(entry['notify_handle'])
+            write_char = self.client.services.get_characteristic(entry['write_handle'])
+
+            if (not notify_char or notify_char.uuid != self.notify_char_uuid or
+                    not write_char or write_char.uuid != self.write_char_uuid or
+                    write_char.service_uuid != entry['service_uuid']):
+                raise ValueError("cached handles do not match the device")
+
+            await self.client.start_notify(notify_char, self._notification_handler)
+            self.write_char_handle = write_char.handle
+            self.using_cached_handles = True
+            logging.info(f"⚡ Using cached GATT handles for {self.name}")
+            return True
+
+        except Exception as e:
+            logging.warning(f"⚠️ Cached GATT handles failed for {self.name}: {e}")
+            self.gatt_cache.invalidate(self.mac_address)
+            return False
+
+    async def _setup_from_services(self):
+        """
+        Walk the services to subscribe and find the write characteristic,
+        caching the resolved handles for the next connection
+
+        Returns:
+            bool: True if the required characteristics were found
+        """
+        # Wait for service discovery to complete
+        await asyncio.sleep(1)
+
+        notify_handle = None
+        self.write_char_handle = None
+        self.using_cached_handles = False
+
+        for service in self.client.services:
+            for char in service.characteristics:
+                # Set up notification handler
+                if char.uuid == self.notify_char_uuid:
+                    await self.client.start_notify(char, self._notification_handler)
+                    notify_handle = char.handle
+                    logging.info(f"📡 Subscribed to notifications: {char.uuid}")
+
+                # Find write characteristic
+                if char.uuid == self.write_char_uuid and service.uuid == self.write_service_uuid:
+                    self.write_char_handle = char.handle
+                    logging.info(f"📝 Found write characteristic: {char.uuid}")
+
+        if self.write_char_handle is None:
+            return False
+
+        if notify_handle is not None:
+            self.gatt_cache.put(self.mac_address, self.write_service_uuid,
+                                notify_handle, self.write_char_handle)
         return True
 
-    async def _notification_handler(self, _sender, data):
+    def _notification_handler(self, _sender, data):
         """
-        Handle incoming notifications from the device
+        Handle incoming notifications from the device, queueing whole frames
+        once any fragments have been reassembled
+
+        Runs inside the BLE notification callback, so it never awaits;
+        frames are handled by the notification queue's consumer task.
 
         Args:
             _sender: The sender object (unused)
             data: The received data
         """
+        if self.recorder:
+            self.recorder.record(Direction.RX, data)
+
+        for frame in self.assembler.feed(data):
+            if self.data_callback:
+                self.notify_queue.put(frame)
+
+    async def _dispatch_frame(self, frame):
+        """Pass a queued frame to the data callback"""
         if self.data_callback:
-            await self.data_callback(data)
+            await self.data_callback(frame)
+
+    def start_recording(self, path):
+        """
+        Capture every command written and notification received to a file,
+        for replay with FrameReplayer
+
+        Args:
+            path: Capture file location, replaced if it exists
+        """
+        self.stop_recording()
+        self.recorder = FrameRecorder(path, self.name)
+        logging.info(f"⏺️ Recording {self.name} traffic to {path}")
+
+    def stop_recording(self):
+        """Stop capturing traffic and close the capture file"""
+        if self.recorder:
+            self.recorder.close()
+            logging.info(f"⏹️ Stopped recording {self.name}: {self.recorder.records} records")
+            self.recorder = None
+
+    def get_link_stats(self):
+        """
+        Get link-quality telemetry for this connection
+
+        Returns:
+            dict: Link state, RSSI, counters, RTT histogram and framing counters
+        """
+        self._sample_rssi()
+
+        stats = self.stats.to_dict()
+        stats['state'] = self.link.state
+        stats['framing'] = self.assembler.stats()
+        stats['notifications'] = self.notify_queue.get_stats()
+        stats['queue'] = self.queue.get_stats()
+        return stats
+
+    def _sample_rssi(self):
+        """Take the latest RSSI from the shared scanner's advertisement cache"""
+        advertisement = self.scanner.lookup(self.mac_address, self.name)
+        if advertisement:
+            self.stats.record_rssi(advertisement.rssi, time.time() - advertisement.age)
+
+    def _on_disconnected(self, client):
+        """
+        Handle the link dropping underneath us
+
+        Args:
+            client: The client that disconnected
+        """
+        if client is self.client and self.is_connected:
+            logging.warning(f"📵 {self.name} disconnected")
+            self.is_connected = False
+            self.link.record_disconnect('link dropped')
 
     async def _disconnect_client(self):
         """Safely disconnect the client"""
@@ -280,13 +438,13 @@ class BleConnection:
             except Exception:
                 pass  # Ignore errors during cleanup
 
-    async def _handle_connection_failure(self, message, retry_delay):
+    def _handle_connection_failure(self, message):
         """
-        Handle connection failure with logging and delay
+        Handle connection failure with logging, the link state machine
+        decides how long to back off before the next attempt
 
         Args:
             message: Error message to log
-            retry_delay: Delay before next retry
         """
-        logging.warning(f"⚠️ {message}, retrying in {retry_delay}s")
-        await asyncio.sleep(retry_delay)
\ No newline at end of file
+        logging.warning(f"⚠️ {message}")
+        self.link.record_failure(message)
\ No newline at end of file
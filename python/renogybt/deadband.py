@@ -0,0 +1,135 @@
+"""
+Deadband change detection so data callbacks only fire when values move
+"""
+
+import time
+from array import array
+from typing import Any, Dict, Optional, Set
+
+class ChangeDetector:
+    """
+    Compares device data against the values last reported, field by field
+
+    A numeric field whose name contains a deadband key (e.g. 'voltage' matches
+    'battery_voltage' and 'cell_voltages') only counts as changed once it has
+    moved more than that deadband from its last reported value; float arrays
+    (e.g. cell voltages) change when any element does. Other fields change on
+    any difference. Everything is reported again once the heartbeat
+    interval has passed, so consumers still hear from flat devices.
+    """
+
+    def __init__(self, deadbands: Dict[str, float], heartbeat_interval: float):
+        """
+        Initialize the detector
+
+        Args:
+            deadbands: Field name fragment to the smallest change worth reporting
+            heartbeat_interval: Seconds after which all fields are reported regardless
+        """
+        self.deadbands = deadbands
+        self.heartbeat_interval = heartbeat_interval
+
+        self._reported: Dict[str, Any] = {}
+        self._field_deadbands: Dict[str, float] = {}  # field name -> resolved deadband
+        self._last_report = None
+        self._reports = 0
+        self._heartbeats = 0
+        self._suppressed = 0
+
+    def deadband(self, field: str) -> float:
+        """
+        Get the deadband for a field, 0 if none of the keys match
+
+        Args:
+            field: Data field name
+
+        Returns:
+            float: Smallest change worth reporting
+        """
+        deadband = self._field_deadbands.get(field)
+        if deadband is None:
+            deadband = next((value for key, value in self.deadbands.items() if key in field), 0.0)
+            self._field_deadbands[field] = deadband
+        return deadband
+
+    def heartbeat_due(self) -> bool:
+        """
+        Check whether the next update reports every field regardless of change
+
+        Returns:
+            bool: True once the heartbeat interval has passed since the last report
+        """
+        return self._last_report is not None and time.monotonic() - self._last_report >= self.heartbeat_interval
+
+    def update(self, data: Dict[str, Any]) -> Optional[Set[str]]:
+        """
+        Compare data against the last report and record it if it should be reported
+
+        Args:
+            data: Current device data, a dict or snapshot
+
+        Returns:
+            set of changed fields (all fields on a heartbeat), or None if nothing
+            moved past its deadband and no heartbeat is due
+        """
+        now = time.monotonic()
+        data = dict(data.items())
+        changed = set()
+
+        for field, value in data.items():
+            if field not in self._reported:
+                changed.add(field)
+                continue
+
+            reported = self._reported[field]
+            if isinstance(value, array):
+                deadband = self.deadband(field)
+                if (len(value) != len(reported)
+                        or any(abs(new - old) > deadband for new, old in zip(value, reported))):
+                    changed.add(field)
+            elif (isinstance(value, (int, float)) and isinstance(reported, (int, float))
+                    and not isinstance(value, bool)):
+                if abs(value - reported) > self.deadband(field):
+                    changed.add(field)
+            elif value != reported:
+                changed.add(field)
+
+        changed.update(field for field in self._reported if field not in data)
+
+        if self._last_report is not None and now - self._last_report >= self.heartbeat_interval:
+            if not changed:
+                self._heartbeats += 1
+            changed = set(data)
+            changed.update(self._reported)
+        elif not changed:
+            self._suppressed += 1
+            return None
+
+        # Only changed fields move their baseline, so slow drift still adds up
+        for field in changed:
+            if field in data:
+                self._reported[field] = data[field]
+            else:
+                self._reported.pop(field, None)
+
+        self._last_report = now
+        self._reports += 1
+        return changed
+
+    def reset(self) -> None:
+        """Forget the last report so the next update reports every field"""
+        self._reported.clear()
+        self._last_report = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get change detection counters
+
+        Returns:
+            dict: Reports made, how many were heartbeats, and updates suppressed
+        """
+        return {
+            'reports': self._reports,
+            'heartbeats': self._heartbeats,
+            'suppressed': self._suppressed
+        }
@@ -4,23 +4,64 @@ Simplified Renogy device base class
 
 import asyncio
 import logging
+import time
+from collections import deque
 from typing import List, Dict, Any, Callable, Optional, Union, Tuple
 
+from .codec import read_command, write_command, write_multiple_command
+from .command_queue import Priority
 from .connection import BleConnection
-from .utils import crc16_modbus, ModbusFunction
-from config.settings import POLL_INTERVAL
+from .deadband import ChangeDetector
+from .exceptions import TransactionError, TransactionTimeoutError, ModbusExceptionError, WriteVerificationError
+from .read_plan import PlannedRead, Refresh, compile_read_plan
+from .scheduler import PollScheduler
+from .snapshots import Snapshot
+from .utils import ModbusFunction
+from config.settings import (POLL_INTERVAL, POLL_AIRTIME_BUDGET, MODBUS_RESPONSE_TIMEOUT, SLOW_REFRESH_INTERVAL,
+                             DATA_DEADBANDS, DATA_HEARTBEAT_INTERVAL, MODBUS_LATE_RESPONSE_GRACE)
+
+# Default max age of each refresh class, None for static sections
+REFRESH_MAX_AGE = {
+    Refresh.ONCE: None,
+    Refresh.SLOW: SLOW_REFRESH_INTERVAL,
+    Refresh.LIVE: POLL_INTERVAL
+}
+
+# Timed-out or cancelled reads remembered so their late responses can be recognised
+EXPIRED_TRANSACTIONS = 8
+
+# Most registers one write-multiple (function 0x10) request may carry
+MAX_WRITE_REGISTERS = 123
+
+class Transaction:
+    """
+    An outstanding Modbus read waiting for its response
+    """
+
+    __slots__ = ('register', 'words', 'future', 'sent_at', 'expired_at')
+
+    def __init__(self, register: int, words: int, future: asyncio.Future):
+        self.register = register
+        self.words = words
+        self.future = future
+        self.sent_at = time.monotonic()
+        self.expired_at = None  # monotonic time the read was given up on
 
 class Device:
     """
     Base class for Renogy BT devices that handles the Modbus protocol
     """
 
+    snapshot_class = dict  # type of self.data, subclasses use a typed snapshot (see snapshots.py)
+
     def __init__(self,
                  mac_address: str,
                  name: str = None,
                  device_id: int = 1,
                  on_data_callback: Callable = None,
-                 on_error_callback: Callable = None):
+                 on_error_callback: Callable = None,
+                 adapter: str = None,
+                 max_in_flight: int = 1):
         """
         Initialize the device with required configuration
 
@@ -28,8 +69,10 @@ class Device:
             mac_address: MAC address of the device
             name: Name/alias of the device (default: based on MAC)
             device_id: Modbus device ID (default: 1)
-            on_data_callback: Callback for device data updates
+            on_data_callback: Callback(device, data, changed) fired when a field moves past its deadband
             on_error_callback: Callback for device errors
+            adapter: Bluetooth adapter ('hci0', 'auto' or None for the default)
+            max_in_flight: Most reads outstanding at once, shrinking automatically on timeouts
         """
         self.mac_address = mac_address
         self.name = name if name else f"Renogy-{mac_address[-5:].replace(':', '')}"
@@ -38,19 +81,33 @@ class Device:
         self.on_error_callback = on_error_callback
 
         # Internal state
-        self.data = {}
+        self.data = self.snapshot_class()
         self.polling = False
         self.polling_task = None
         self._sections = []  # List of register sections to read
-        self._current_section = 0
+        self._read_plan = None  # Sections merged into Modbus reads, compiled on first poll
+        self._scheduler = None  # Deadline scheduler over the read plan
         self._poll_lock = asyncio.Lock()
         self._pending_futures = {}  # For write operations
+        self._transactions = deque()  # Outstanding reads, oldest first
+        self._writes = deque()  # Outstanding write-multiple requests, oldest first
+        self._expired = deque(maxlen=EXPIRED_TRANSACTIONS)  # Reads that gave up waiting, oldest first
+        self._size_locks = {}  # word count -> lock, so reads of one size are never outstanding together
+        self._refreshing = {}  # On-demand reads in flight, shared by concurrent refreshes
+        self._raw_frames = {}  # Last raw frame parsed per section register, so repeats skip the parser
+        self._parsed = False  # Whether a parser has run since the last change detection
+        self._parsed_sections = 0
+        self._duplicate_sections = 0
+        self.last_rtt = None  # Round-trip time of the last read, in seconds
+        self.change_detector = ChangeDetector(DATA_DEADBANDS, DATA_HEARTBEAT_INTERVAL)
 
         # Create BLE connection
         self.connection = BleConnection(
             mac_address=mac_address,
             name=self.name,
-            data_callback=self._on_data_received
+            data_callback=self._on_data_received,
+            adapter=adapter,
+            max_in_flight=max_in_flight
         )
 
         logging.info(f"✨ Initialized device: {self.name}")
@@ -78,6 +135,7 @@ class Device:
         if self.polling:
             await self.stop_polling()
 
+        self.connection.stop_recording()
         return await self.connection.disconnect()
 
     async def start_polling(self) -> bool:
@@ -95,9 +153,9 @@ class Device:
             logging.error(f"❌ No sections defined for device: {self.name}")
             return False
 
-        if not await self.connection.ensure_connected():
-            logging.error(f"❌ Cannot start polling: {self.name} not connected")
-            return False
+        # The polling loop keeps reconnecting through the link state machine, so a device that is down still starts
+        if not self.connection.is_connected:
+            logging.warning(f"📵 {self.name} not connected yet, polling will start once it reconnects")
 
         self.polling = True
         self.polling_task = asyncio.create_task(self._polling_loop())
@@ -132,26 +190,145 @@ class Device:
             word_count: Number of words to read
 
         Returns:
-            bool: True if read command was sent successfully
+            bool: True if the device answered the read (use transact() for the response frame)
+        """
+        try:
+            await self.transact(register, word_count)
+            return True
+        except TransactionError as e:
+            logging.warning(f"⚠️ Read failed for {self.name}: {e}")
+            return False
+
+    async def transact(self, register: int, word_count: int = 1,
+                       timeout: float = MODBUS_RESPONSE_TIMEOUT,
+                       priority: int = Priority.ON_DEMAND) -> bytearray:
+        """
+        Read registers and wait for the matching response
+
+        Args:
+            register: Register address
+            word_count: Number of words to read
+            timeout: Seconds to wait for the response once sent
+            priority: Queue priority class (see Priority)
+
+        Returns:
+            bytearray: The response frame
+
+        Raises:
+            TransactionError: If the command could not be sent
+            TransactionTimeoutError: If no response arrived in time
+            ModbusExceptionError: If the device returned an exception response
+        """
+        return await self.connection.queue.run(
+            lambda: self._transact(register, word_count, timeout),
+            priority,
+            f"read {register}"
+        )
+
+    async def _transact(self, register: int, word_count: int, timeout: float) -> bytearray:
+        """
+        Send a read and wait for its response, run by the command queue
+
+        Read responses only carry a byte count, so a read waits while another
+        read of the same size is outstanding, or has timed out recently
+        enough that its reply may still arrive.
+        """
+        async with self._size_locks.setdefault(word_count, asyncio.Lock()):
+            await self._wait_for_late_replies(word_count)
+            return await self._send_read(register, word_count, timeout)
+
+    async def _wait_for_late_replies(self, word_count: int) -> None:
+        """Hold a read back until no timed-out read of the same size can still answer"""
+        while True:
+            self._prune_expired()
+            expired = [t.expired_at for t in self._expired if t.words == word_count]
+            if not expired:
+                return
+            remaining = max(expired) + MODBUS_LATE_RESPONSE_GRACE - time.monotonic()
+            await asyncio.sleep(min(remaining, 0.1))
+
+    def _prune_expired(self) -> None:
+        """Forget timed-out reads whose late reply is no longer expected"""
+        cutoff = time.monotonic() - MODBUS_LATE_RESPONSE_GRACE
+        while self._expired and self._expired[0].expired_at < cutoff:
+            self._expired.popleft()
+
+    async def _send_read(self, register: int, word_count: int, timeout: float) -> bytearray:
+        """Send a read and wait for the response of its size"""
+        transaction = self._expect_read(register, word_count)
+        future = transaction.future
+
+        try:
+            cmd = self._create_read_command(register, word_count)
+            if not await self.connection.write(cmd):
+                self._transactions.remove(transaction)
+                raise TransactionError(f"Failed to send read for register {register}", register)
+
+            try:
+                frame = await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                self.connection.stats.record_timeout()
+                self.connection.queue.record_timeout()
+                raise TransactionTimeoutError(register, timeout)
+            except ModbusExceptionError:
+                self.connection.stats.record_modbus_error()
+                raise
+
+            self.last_rtt = time.monotonic() - transaction.sent_at
+            self.connection.stats.record_rtt(self.last_rtt)
+            self.connection.queue.record_success()
+            return frame
+
+        finally:
+            self._forget_read(transaction)
+
+    def _expect_read(self, register: int, word_count: int) -> Transaction:
         """
-        # Create modbus read command
-        cmd = self._create_read_command(register, word_count)
-        return await self.connection.write(cmd)
+        Register an outstanding read so its response can be matched
+
+        Args:
+            register: Register address
+            word_count: Number of words read
 
-    async def write_register(self, register: int, value: int) -> bool:
+        Returns:
+            Transaction: Whose future resolves with the response frame
+        """
+        transaction = Transaction(register, word_count, asyncio.get_event_loop().create_future())
+        self._transactions.append(transaction)
+        return transaction
+
+    def _forget_read(self, transaction: Transaction) -> None:
+        """Stop waiting for a read, remembering it if it was still outstanding"""
+        # A read still outstanding here was sent but given up on
+        if transaction in self._transactions:
+            self._transactions.remove(transaction)
+            transaction.expired_at = time.monotonic()
+            self._expired.append(transaction)
+
+    async def write_register(self, register: int, value: int,
+                             priority: int = Priority.CONTROL) -> bool:
         """
         Write a value to a register
 
         Args:
             register: Register address
             value: Value to write
+            priority: Queue priority class (see Priority)
 
         Returns:
             bool: True if write was successful
         """
+        return await self.connection.queue.run(
+            lambda: self._write_register(register, value),
+            priority,
+            f"write {register}"
+        )
+
+    async def _write_register(self, register: int, value: int) -> bool:
+        """Send a write and wait for its echo, run by the command queue"""
         # Create a future to wait for the response
         future = asyncio.get_event_loop().create_future()
-        cmd_id = (register, value)
+        cmd_id = (register, value & 0xFFFF)  # the device echoes the 16-bit value
         self._pending_futures[cmd_id] = future
 
         # Create modbus write command
@@ -171,7 +348,71 @@ class Device:
                 del self._pending_futures[cmd_id]
             return False
 
-    def add_section(self, register: int, word_count: int, parser: Callable = None) -> None:
+    async def write_registers(self, register: int, values: List[int], verify: bool = False,
+                              timeout: float = MODBUS_RESPONSE_TIMEOUT,
+                              priority: int = Priority.CONTROL) -> None:
+        """
+        Write consecutive registers in one request (Modbus function 0x10)
+
+        Args:
+            register: First register address
+            values: 16-bit values for register, register + 1, ...
+            verify: Read the registers back afterwards and check they hold the values
+            timeout: Seconds to wait for each response once sent
+            priority: Queue priority class (see Priority)
+
+        Raises:
+            ValueError: If there are no values or more than MAX_WRITE_REGISTERS
+            TransactionError: If the command could not be sent
+            TransactionTimeoutError: If no response arrived in time
+            ModbusExceptionError: If the device returned an exception response
+            WriteVerificationError: If the read-back does not match
+        """
+        if not 0 < len(values) <= MAX_WRITE_REGISTERS:
+            raise ValueError(f"Can write 1 to {MAX_WRITE_REGISTERS} registers at once, got {len(values)}")
+
+        await self.connection.queue.run(
+            lambda: self._write_registers(register, values, verify, timeout),
+            priority,
+            f"write {register}+{len(values)}"
+        )
+
+    async def _write_registers(self, register: int, values: List[int], verify: bool, timeout: float) -> None:
+        """Send a write-multiple, wait for its response and optionally read back, run by the command queue"""
+        transaction = Transaction(register, len(values), asyncio.get_event_loop().create_future())
+        self._writes.append(transaction)
+
+        try:
+            cmd = self._create_write_multiple_command(register, values)
+            if not await self.connection.write(cmd):
+                raise TransactionError(f"Failed to send write for register {register}", register)
+
+            try:
+                await asyncio.wait_for(transaction.future, timeout)
+            except asyncio.TimeoutError:
+                self.connection.stats.record_timeout()
+                self.connection.queue.record_timeout()
+                raise TransactionTimeoutError(register, timeout)
+            except ModbusExceptionError:
+                self.connection.stats.record_modbus_error()
+                raise
+
+            self.connection.stats.record_rtt(time.monotonic() - transaction.sent_at)
+
+        finally:
+            if transaction in self._writes:
+                self._writes.remove(transaction)
+
+        logging.info(f"✏️ Wrote {len(values)} registers from {register} on {self.name}")
+
+        if verify:
+            frame = await self._transact(register, len(values), timeout)
+            actual = [(frame[3 + i * 2] << 8) | frame[4 + i * 2] for i in range(len(values))]
+            if actual != list(values):
+                raise WriteVerificationError(register, list(values), actual)
+
+    def add_section(self, register: int, word_count: int, parser: Callable = None,
+                    refresh: str = Refresh.LIVE, max_age: float = None, fields: Tuple[str, ...] = ()) -> None:
         """
         Add a register section to poll
 
@@ -179,7 +420,13 @@ class Device:
             register: Register address
             word_count: Number of words to read
             parser: Optional function to parse the response
+            refresh: How often the section changes (see Refresh)
+            max_age: Target freshness in seconds (default: set by the refresh class)
+            fields: Data fields the parser fills, so refresh() knows which sections to read
         """
+        if max_age is None:
+            max_age = REFRESH_MAX_AGE[refresh]
+
         if register < 0 or word_count <= 0:
             logging.error(f"❌ Invalid section: register={register}, words={word_count}")
             return
@@ -187,28 +434,138 @@ class Device:
         self._sections.append({
             'register': register,
             'words': word_count,
-            'parser': parser
+            'parser': parser,
+            'refresh': refresh,
+            'max_age': max_age,
+            'fields': tuple(fields)
         })
-        logging.info(f"➕ Added polling section: reg={register}, words={word_count}")
+        self._read_plan = None
+        logging.info(f"➕ Added polling section: reg={register}, words={word_count}, "
+                     f"refresh={refresh}, max_age={max_age}")
+
+    async def refresh(self, fields: List[str] = None, max_age: float = 0.0) -> Dict[str, Any]:
+        """
+        Read fields now instead of waiting for their next poll
+
+        Only the reads covering the requested fields are sent, at on-demand
+        priority so they go ahead of queued background polls. Reads newer than
+        max_age are answered from the current data without touching the link.
+
+        Args:
+            fields: Data fields wanted (default: every field of every section)
+            max_age: Seconds old a read may be and still be returned as is
+
+        Returns:
+            dict: The requested fields in wire format, leaving out fields never parsed
+
+        Raises:
+            ValueError: If no section fills one of the fields
+        """
+        plan = self.get_read_plan()
+
+        if fields is None:
+            reads = list(plan)
+        else:
+            reads = []
+            for field in fields:
+                planned = next((planned for planned in plan
+                                if any(field in section['fields'] for section, _ in planned.sections)), None)
+                if planned is None:
+                    raise ValueError(f"{self.name} has no section reading {field}")
+                if planned not in reads:
+                    reads.append(planned)
+
+        now = time.monotonic()
+        stale = [planned for planned in reads if planned.last_read is None or now - planned.last_read > max_age]
+
+        if stale and self.connection.is_connected:
+            logging.debug(f"🔃 {self.name} refreshing {len(stale)} of {len(reads)} reads on demand")
+            results = await asyncio.gather(*(self._refresh_read(planned) for planned in stale),
+                                           return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logging.warning(f"⚠️ On-demand read failed for {self.name}: {result}")
+        elif stale:
+            logging.warning(f"📵 {self.name} is not connected, returning cached values")
+
+        data = self.data.to_dict() if isinstance(self.data, Snapshot) else dict(self.data)
+        if fields is None:
+            return data
+        return {field: data[field] for field in fields if field in data}
+
+    async def _refresh_read(self, planned: PlannedRead) -> bool:
+        """Perform a read on demand, sharing it with other refreshes already waiting on it"""
+        task = self._refreshing.get(planned)
+        if task is None:
+            task = asyncio.ensure_future(self._read_planned(planned, Priority.ON_DEMAND))
+            self._refreshing[planned] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(planned, None))
+
+        # One caller giving up must not cancel the read for the others
+        return await asyncio.shield(task)
+
+    def get_read_plan(self) -> List[PlannedRead]:
+        """
+        Get the reads that cover all sections, compiling the plan if needed
+
+        Returns:
+            list: Planned reads in polling order
+        """
+        if self._read_plan is None:
+            self._read_plan = compile_read_plan(self._sections)
+            self._scheduler = PollScheduler(self._read_plan, POLL_AIRTIME_BUDGET, POLL_INTERVAL)
+            for planned in self._read_plan:
+                read_command(self.device_id, planned.register, planned.words)
+            logging.info(f"🧮 {self.name} read plan: {len(self._sections)} sections in "
+                         f"{len(self._read_plan)} reads {self._read_plan}")
+        return self._read_plan
+
+    def get_link_stats(self) -> Dict[str, Any]:
+        """
+        Get link telemetry for this device's connection and poll schedule
+
+        Returns:
+            dict: Connection link stats plus scheduler counters under 'schedule'
+                and change detection counters under 'changes'
+        """
+        stats = self.connection.get_link_stats()
+        if self._scheduler:
+            stats['schedule'] = self._scheduler.get_stats()
+        stats['changes'] = self.change_detector.get_stats()
+        stats['changes']['parsed_sections'] = self._parsed_sections
+        stats['changes']['duplicate_sections'] = self._duplicate_sections
+        return stats
 
     async def _polling_loop(self) -> None:
         """Internal polling loop for the device"""
         try:
             while self.polling:
+                # Reconnect through the link state machine, retrying forever
+                if not self.connection.is_connected:
+                    await self._reconnect()
+                    continue
+
+                if not self._sections:
+                    await asyncio.sleep(POLL_INTERVAL)
+                    continue
+
+                # Wait for the most urgent reads, checking the link at least every POLL_INTERVAL
+                self.get_read_plan()
+                reads, delay = self._scheduler.next_reads(self.connection.connected_at or 0,
+                                                          self.connection.queue.window)
+                if delay > 0:
+                    await asyncio.sleep(min(delay, POLL_INTERVAL))
+                    continue
+
                 async with self._poll_lock:
                     try:
-                        # Verify connection
-                        if not await self.connection.ensure_connected():
-                            raise Exception(f"Device {self.name} not connected")
-
-                        # Read current section
-                        await self._read_next_section()
-
-                        # Small delay between reads
-                        await asyncio.sleep(0.5)
+                        # Pipeline due reads up to the connection's in-flight window
+                        results = await asyncio.gather(*(self._read_planned(planned) for planned in reads))
+                        self.connection.link.record_poll(all(results), 'read failed')
 
                     except Exception as e:
                         logging.error(f"⚠️ Error polling {self.name}: {e}")
+                        self.connection.link.record_poll(False, str(e))
 
                         if self.on_error_callback:
                             try:
@@ -216,28 +573,6 @@ class Device:
                             except Exception as callback_error:
                                 logging.error(f"❌ Error in error callback: {callback_error}")
 
-                        # If connection issues, try to reconnect
-                        if not self.connection.is_connected:
-                            logging.warning(f"📵 Connection lost to {self.name}, attempting to reconnect...")
-
-                            # Disconnect first
-                            await self.connection.disconnect()
-                            await asyncio.sleep(2)  # Small delay before reconnect
-
-                            # Try to reconnect
-                            success = await self.connection.connect(3)
-                            if not success:
-                                logging.error(f"❌ Failed to reconnect to {self.name}")
-                                self.polling = False
-                                break
-
-                            # Successfully reconnected
-                            logging.info(f"✅ Successfully reconnected to {self.name}")
-                            await asyncio.sleep(2)
-
-                # Sleep between polling cycles
-                await asyncio.sleep(POLL_INTERVAL)
-
         except asyncio.CancelledError:
             # Normal cancellation
             logging.info(f"⏹️ Polling task cancelled for {self.name}")
@@ -253,18 +588,111 @@ class Device:
                 except Exception:
                     pass
 
-    async def _read_next_section(self) -> bool:
-        """Read the next section from the device"""
-        if not self._sections:
+    async def _reconnect(self) -> None:
+        """Reconnect after the link was lost, pacing attempts with the link's backoff"""
+        logging.warning(f"📵 Connection lost to {self.name}, attempting to reconnect...")
+
+        await self.connection.disconnect()
+        self.connection.link.record_disconnect('connection lost')
+
+        while self.polling and not self.connection.is_connected:
+            await self.connection.link.wait()
+            if await self.connection.connect(1):
+                logging.info(f"✅ Successfully reconnected to {self.name}")
+
+    async def _read_planned(self, planned: PlannedRead, priority: int = Priority.POLL) -> bool:
+        """
+        Perform a planned read and parse each section it covers
+
+        Args:
+            planned: The read to perform
+            priority: Queue priority class (see Priority)
+
+        Returns:
+            bool: True if the read returned data
+        """
+        started_at = time.monotonic()
+        connected_at = self.connection.connected_at or 0
+        success = False
+
+        try:
+            success = await self._read_sections(planned, priority)
+        finally:
+            if planned in self._read_plan:
+                self._scheduler.record_read(planned, started_at, success, connected_at)
+
+        if success:
+            await self._notify_data()
+
+        return success
+
+    async def _notify_data(self) -> None:
+        """Notify data callback once every section has been read and something moved past its deadband"""
+        if not self.on_data_callback or not all(p.last_read is not None for p in self._read_plan):
+            return
+
+        # Repeated frames left the data as it was, so only a heartbeat can be due
+        if not self._parsed and not self.change_detector.heartbeat_due():
+            return
+
+        self._parsed = False
+        changed = self.change_detector.update(self.data)
+        if changed is not None:
+            try:
+                await self.on_data_callback(self, self.data.copy(), changed)
+            except Exception as e:
+                logging.error(f"❌ Error in data callback: {e}")
+
+    async def _read_sections(self, planned: PlannedRead, priority: int = Priority.POLL) -> bool:
+        """Read a planned read and run its section parsers"""
+        try:
+            frame = await self.transact(planned.register, planned.words, priority=priority)
+        except ModbusExceptionError as e:
+            logging.warning(f"⚠️ Read failed for {self.name}: {e}")
+            if planned.merged:
+                self._unmerge(planned)
+            return False
+        except TransactionTimeoutError as e:
+            logging.warning(f"⚠️ Read failed for {self.name}: {e}")
             return False
 
-        section = self._sections[self._current_section]
-        result = await self.read_register(section['register'], section['words'])
+        self._parse_sections(planned, frame)
+        return True
+
+    def _parse_sections(self, planned: PlannedRead, frame: bytearray) -> None:
+        """
+        Run the parser of each section a read's response covers, skipping
+        sections whose raw frame is byte-for-byte the one parsed last time
+        """
+        for section, section_frame in planned.split(frame):
+            register = section['register']
+            if self._raw_frames.get(register) == section_frame:
+                self._duplicate_sections += 1
+                continue
+
+            if section.get('parser'):
+                try:
+                    section['parser'](section_frame)
+                except Exception as e:
+                    logging.error(f"⚠️ Error parsing data: {e}")
+                    continue
+
+            self._raw_frames[register] = bytes(section_frame)
+            self._parsed_sections += 1
+            self._parsed = True
 
-        # Move to next section for next poll
-        self._current_section = (self._current_section + 1) % len(self._sections)
+    def _unmerge(self, planned: PlannedRead) -> None:
+        """
+        Replace a merged read the device rejected with one read per section
 
-        return result
+        Args:
+            planned: The merged read
+        """
+        logging.warning(f"✂️ {self.name} rejected merged read {planned}, reading its sections separately")
+
+        singles = [compile_read_plan([section])[0] for section, _ in planned.sections]
+        index = self._read_plan.index(planned)
+        self._read_plan[index:index + 1] = singles
 
     async def _on_data_received(self, data: bytearray) -> None:
         """
@@ -284,28 +712,75 @@ class Device:
             error_msg = f"Device reported error: {data.hex()}"
             logging.error(f"⚠️ {error_msg}")
 
+            # Fail the read that caused it. The device answers in order, so a timed-out read
+            # still within its grace window is older than any live one and claims the reply first
+            self._prune_expired()
+            if self._expired:
+                self._expired.popleft()
+                logging.debug(f"🐢 Dropping late exception response for {self.name}: {data.hex()}")
+                self.connection.stats.record_late_frame()
+            elif self._transactions:
+                transaction = self._transactions.popleft()
+                if not transaction.future.done():
+                    transaction.future.set_exception(
+                        ModbusExceptionError(function_code, data[2], transaction.register)
+                    )
+            else:
+                self.connection.stats.record_unmatched_frame()
+
             if self.on_error_callback:
                 await self.on_error_callback(self, error_msg)
 
             return
 
-        # Handle read response
+        # Fail the oldest write-multiple on its exception response
+        if function_code == ModbusFunction.WRITE_MULTIPLE_ERROR:
+            logging.error(f"⚠️ Device rejected write: {data.hex()}")
+            if self._writes:
+                transaction = self._writes.popleft()
+                if not transaction.future.done():
+                    transaction.future.set_exception(
+                        ModbusExceptionError(function_code, data[2], transaction.register)
+                    )
+            else:
+                self.connection.stats.record_unmatched_frame()
+            return
+
+        # Complete the write-multiple this response echoes (start register and count)
+        if function_code == ModbusFunction.WRITE_MULTIPLE and len(data) >= 6:
+            register = (data[2] << 8) | data[3]
+            count = (data[4] << 8) | data[5]
+
+            for transaction in self._writes:
+                if transaction.register == register and transaction.words == count:
+                    self._writes.remove(transaction)
+                    if not transaction.future.done():
+                        transaction.future.set_result(True)
+                    return
+
+            logging.debug(f"🗑️ Dropping write response with no matching request for {self.name}: {data.hex()}")
+            self.connection.stats.record_unmatched_frame()
+            return
+
+        # Handle read response. Only the byte count identifies it, so a timed-out read of
+        # the same size claims it first; _transact keeps such reads from overlapping
         if function_code == ModbusFunction.READ and len(data) > 5:
-            section_idx = (self._current_section - 1) % len(self._sections)
-            section = self._sections[section_idx]
+            byte_count = data[2]
 
-            if section.get('parser'):
-                try:
-                    section['parser'](data)
-                except Exception as e:
-                    logging.error(f"⚠️ Error parsing data: {e}")
+            self._prune_expired()
+            if self._match_transaction(self._expired, byte_count) is not None:
+                logging.debug(f"🐢 Dropping late read response for {self.name}: {data.hex()}")
+                self.connection.stats.record_late_frame()
+                return
 
-            # Notify data callback after processing full cycle
-            if self._current_section == 0 and self.on_data_callback:
-                try:
-                    await self.on_data_callback(self, self.data.copy())
-                except Exception as e:
-                    logging.error(f"❌ Error in data callback: {e}")
+            transaction = self._match_transaction(self._transactions, byte_count)
+            if transaction is not None:
+                if not transaction.future.done():
+                    transaction.future.set_result(data)
+                return
+
+            logging.debug(f"🗑️ Dropping read response with no matching request for {self.name}: {data.hex()}")
+            self.connection.stats.record_unmatched_frame()
 
         # Handle write response
         elif function_code == ModbusFunction.WRITE and len(data) >= 5:
@@ -313,51 +788,47 @@ class Device:
             register = (data[2] << 8) | data[3]
             value = (data[4] << 8) | data[5]
 
-            # Complete any pending futures for this write
-            completed = False
-            cmd_id = (register, value)
+            # Complete the write this response echoes (register and value)
+            future = self._pending_futures.pop((register, value), None)
+            if future is not None:
+                if not future.done():
+                    future.set_result(True)
+            else:
+                logging.debug(f"🗑️ Dropping write response with no matching request for {self.name}: {data.hex()}")
+                self.connection.stats.record_unmatched_frame()
+
+    @staticmethod
+    def _match_transaction(transactions: deque, byte_count: int) -> Optional[Transaction]:
+        """
+        Remove and return the oldest read expecting a response of this size
 
-            if cmd_id in self._pending_futures:
-                self._pending_futures[cmd_id].set_result(True)
-                del self._pending_futures[cmd_id]
-                completed = True
+        Args:
+            transactions: Reads to search, oldest first
+            byte_count: Byte count from the response
 
-            # Try with just the register if exact match not found
-            if not completed:
-                for pending_id in list(self._pending_futures.keys()):
-                    if pending_id[0] == register:
-                        self._pending_futures[pending_id].set_result(True)
-                        del self._pending_futures[pending_id]
-                        break
+        Returns:
+            Transaction if one matched, otherwise None
+        """
+        for transaction in transactions:
+            if transaction.words * 2 == byte_count:
+                transactions.remove(transaction)
+                return transaction
+        return None
 
-    def _create_read_command(self, register: int, word_count: int) -> bytearray:
+    def _create_read_command(self, register: int, word_count: int) -> bytes:
         """
-        Create a Modbus read command
+        Create a Modbus read command, encoded once per register range (see codec.read_command)
 
         Args:
             register: Register address
             word_count: Number of words to read
 
         Returns:
-            bytearray: Command bytes
+            bytes: Command bytes
         """
-        cmd = [
-            self.device_id,
-            ModbusFunction.READ,
-            register >> 8,
-            register & 0xFF,
-            word_count >> 8,
-            word_count & 0xFF
-        ]
-
-        # Calculate CRC
-        crc = crc16_modbus(bytes(cmd))
-        cmd.append(crc[0])
-        cmd.append(crc[1])
-
-        return bytearray(cmd)
+        return read_command(self.device_id, register, word_count)
 
-    def _create_write_command(self, register: int, value: int) -> bytearray:
+    def _create_write_command(self, register: int, value: int) -> bytes:
         """
         Create a Modbus write command
 
@@ -366,20 +837,19 @@ class Device:
             value: Value to write
 
         Returns:
-            bytearray: Command bytes
-        """
-        cmd = [
-            self.device_id,
-            ModbusFunction.WRITE,
-            register >> 8,
-            register & 0xFF,
-            value >> 8,
-            value & 0xFF
-        ]
-
-        # Calculate CRC
-        crc = crc16_modbus(bytes(cmd))
-        cmd.append(crc[0])
-        cmd.append(crc[1])
-
-        return bytearray(cmd)
\ No newline at end of file
+            bytes: Command bytes
+        """
+        return write_command(self.device_id, register, value)
+
+    def _create_write_multiple_command(self, register: int, values: List[int]) -> bytes:
+        """
+        Create a Modbus write-multiple command
+
+        Args:
+            register: First register address
+            values: 16-bit values to write
+
+        Returns:
+            bytes: Command bytes
+        """
+        return write_multiple_command(self.device_id, register, values)
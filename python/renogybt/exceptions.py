@@ -0,0 +1,39 @@
+"""
+Exceptions raised by the renogybt library
+"""
+
+class RenogyError(Exception):
+    """Base class for renogybt errors"""
+
+class TransactionError(RenogyError):
+    """A Modbus request could not be completed"""
+
+    def __init__(self, message: str, register: int = None):
+        super().__init__(message)
+        self.register = register
+
+class TransactionTimeoutError(TransactionError):
+    """No response arrived for a Modbus request in time"""
+
+    def __init__(self, register: int, timeout: float):
+        super().__init__(f"No response for register {register} within {timeout}s", register)
+        self.timeout = timeout
+
+class ModbusExceptionError(TransactionError):
+    """The device answered a Modbus request with an exception response"""
+
+    def __init__(self, function_code: int, exception_code: int, register: int = None):
+        super().__init__(
+            f"Device returned exception {exception_code} for function {function_code & 0x7F}",
+            register
+        )
+        self.function_code = function_code
+        self.exception_code = exception_code
+
+class WriteVerificationError(TransactionError):
+    """Registers read back after a write do not hold the values written"""
+
+    def __init__(self, register: int, expected: list, actual: list):
+        super().__init__(f"Registers from {register} read back {actual}, expected {expected}", register)
+        self.expected = expected
+        self.actual = actual
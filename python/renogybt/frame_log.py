@@ -0,0 +1,212 @@
+"""
+Binary capture of raw BLE traffic and replay of captures through a device
+"""
+
+import asyncio
+import logging
+import os
+import struct
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .framing import FrameAssembler
+from .utils import ModbusFunction
+
+# File layout: MAGIC, name length (1 byte), device name, then records
+MAGIC = b'RNGYFRM1'
+RECORD_HEADER = struct.Struct('>dBH')  # monotonic timestamp, direction, payload length
+FLUSH_RECORDS = 64  # records buffered before they are flushed to disk
+FLUSH_INTERVAL = 5  # seconds - longest a record stays buffered, so a crash loses little of the capture
+
+class Direction:
+    TX = 0  # command written to the device
+    RX = 1  # notification received from the device, before reassembly
+
+class FrameRecord:
+    """
+    One captured write or notification
+    """
+
+    __slots__ = ('timestamp', 'direction', 'data')
+
+    def __init__(self, timestamp: float, direction: int, data: bytes):
+        self.timestamp = timestamp
+        self.direction = direction
+        self.data = data
+
+class FrameRecorder:
+    """
+    Appends every command and notification of a connection to a capture file
+    """
+
+    def __init__(self, path: str, name: str):
+        """
+        Create the capture file, replacing any file already at the path
+
+        Args:
+            path: Capture file location
+            name: Device name stored in the file header
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        encoded = name.encode('utf-8')[:255]
+        self.path = path
+        self.records = 0
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC + bytes((len(encoded),)) + encoded)
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def record(self, direction: int, data: bytes) -> None:
+        """
+        Append a record
+
+        Args:
+            direction: Direction.TX or Direction.RX
+            data: Raw bytes written or received
+        """
+        if self._file is None:
+            return
+        now = time.monotonic()
+        self._file.write(RECORD_HEADER.pack(now, direction, len(data)))
+        self._file.write(data)
+        self.records += 1
+
+        # Flush in batches rather than per record, but often enough that the capture survives a crash
+        self._unflushed += 1
+        if self._unflushed >= FLUSH_RECORDS or now - self._flushed_at >= FLUSH_INTERVAL:
+            self._file.flush()
+            self._unflushed = 0
+            self._flushed_at = now
+
+    def close(self) -> None:
+        """Flush and close the capture file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def read_frame_log(path: str) -> Tuple[str, Iterator[FrameRecord]]:
+    """
+    Open a capture file
+
+    Args:
+        path: Capture file location
+
+    Returns:
+        (device name, iterator over its records in capture order)
+
+    Raises:
+        ValueError: If the file is not a capture
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    if not content.startswith(MAGIC):
+        raise ValueError(f"{path} is not a frame capture")
+
+    name_length = content[len(MAGIC)]
+    start = len(MAGIC) + 1
+    name = content[start:start + name_length].decode('utf-8')
+
+    def records() -> Iterator[FrameRecord]:
+        offset = start + name_length
+        view = memoryview(content)
+        while offset + RECORD_HEADER.size <= len(content):
+            timestamp, direction, length = RECORD_HEADER.unpack_from(content, offset)
+            offset += RECORD_HEADER.size
+            if offset + length > len(content):
+                logging.warning(f"⚠️ Capture {path} ends with a truncated record")
+                return
+            yield FrameRecord(timestamp, direction, bytes(view[offset:offset + length]))
+            offset += length
+
+    return name, records()
+
+class FrameReplayer:
+    """
+    Feeds a capture back through a device as if it came from the device's
+    connection: recorded reads become outstanding transactions, notifications
+    are reassembled and passed to Device._on_data_received, and completed
+    reads run the device's section parsers and data callback
+    """
+
+    def __init__(self, device: Any):
+        """
+        Initialize the replayer
+
+        Args:
+            device: Device to drive; it should not be connected
+        """
+        self.device = device
+        self.assembler = FrameAssembler()
+        self.stats = {'commands': 0, 'notifications': 0, 'frames': 0, 'reads': 0, 'failed_reads': 0,
+                      'unplanned_reads': 0}
+
+    async def run(self, path: str, realtime: bool = False, speed: float = 1.0) -> Dict[str, Any]:
+        """
+        Replay a capture
+
+        Args:
+            path: Capture file location
+            realtime: Keep the recorded spacing between records instead of going as fast as possible
+            speed: Playback speed multiplier when realtime
+
+        Returns:
+            dict: Replay counters and elapsed seconds
+        """
+        name, records = read_frame_log(path)
+        logging.info(f"⏯️ Replaying {name} capture {path} into {self.device.name}")
+
+        plan = {(planned.register, planned.words): planned for planned in self.device.get_read_plan()}
+        pending: List[Tuple[Any, Any]] = []  # (transaction, planned read) awaiting a response
+        started_at = time.monotonic()
+        first_timestamp = None
+
+        for record in records:
+            if realtime:
+                if first_timestamp is None:
+                    first_timestamp = record.timestamp
+                delay = (record.timestamp - first_timestamp) / speed - (time.monotonic() - started_at)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            if record.direction == Direction.TX:
+                self.stats['commands'] += 1
+                data = record.data
+                if len(data) >= 6 and data[1] == ModbusFunction.READ:
+                    register = (data[2] << 8) | data[3]
+                    words = (data[4] << 8) | data[5]
+                    pending.append((self.device._expect_read(register, words), plan.get((register, words))))
+                continue
+
+            self.stats['notifications'] += 1
+            for frame in self.assembler.feed(record.data):
+                self.stats['frames'] += 1
+                await self.device._on_data_received(frame)
+
+            for entry in [entry for entry in pending if entry[0].future.done()]:
+                pending.remove(entry)
+                await self._complete(*entry)
+
+        for transaction, _ in pending:
+            self.device._forget_read(transaction)
+
+        self.stats['elapsed'] = round(time.monotonic() - started_at, 3)
+        return self.stats
+
+    async def _complete(self, transaction: Any, planned: Any) -> None:
+        """Parse a replayed read the way a live poll would"""
+        if transaction.future.exception() is not None:
+            self.stats['failed_reads'] += 1
+            return
+
+        if planned is None:
+            self.stats['unplanned_reads'] += 1
+            return
+
+        self.stats['reads'] += 1
+        self.device._parse_sections(planned, transaction.future.result())
+        planned.last_read = time.monotonic()
+        await self.device._notify_data()
@@ -0,0 +1,148 @@
+"""
+Reassembly of Modbus RTU frames from fragmented BLE notifications
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional
+
+from .codec import CRC_LENGTH, crc_valid
+from .utils import ModbusFunction
+
+# Default configuration
+DEFAULT_STALE_TIMEOUT = 1.0  # seconds before a partial frame is discarded
+
+# Length of fixed-size frames by function code
+FIXED_FRAME_LENGTHS = {
+    ModbusFunction.WRITE: 8,
+    ModbusFunction.WRITE_MULTIPLE: 8
+}
+EXCEPTION_FRAME_LENGTH = 5
+READ_HEADER_LENGTH = 3  # device id, function, byte count
+
+class FrameAssembler:
+    """
+    Per-connection buffer that turns a stream of BLE notifications into
+    whole, CRC-checked Modbus frames
+    """
+
+    def __init__(self, stale_timeout: float = DEFAULT_STALE_TIMEOUT):
+        """
+        Initialize the assembler
+
+        Args:
+            stale_timeout: Seconds after which an incomplete frame is dropped
+        """
+        self.stale_timeout = stale_timeout
+        self._buffer = bytearray()
+        self._last_fragment_at = 0.0
+
+        # Counters
+        self.notifications = 0
+        self.frames = 0
+        self.fragments = 0
+        self.resyncs = 0
+        self.crc_errors = 0
+
+    def feed(self, data) -> List[bytearray]:
+        """
+        Add a notification to the buffer and extract complete frames
+
+        Args:
+            data: Notification payload
+
+        Returns:
+            list: Complete frames with a valid CRC, in arrival order
+        """
+        now = time.monotonic()
+        self.notifications += 1
+
+        # A partial frame that was never completed is garbage by now
+        if self._buffer and now - self._last_fragment_at > self.stale_timeout:
+            logging.debug(f"🧹 Discarding stale partial frame: {self._buffer.hex()}")
+            self._buffer.clear()
+            self.resyncs += 1
+
+        self._buffer += data
+        self._last_fragment_at = now
+
+        frames = []
+
+        while True:
+            length = self._expected_length()
+
+            # Need more data to know the frame length
+            if length is None:
+                break
+
+            # Not the start of a frame, skip a byte and look again
+            if length == 0:
+                del self._buffer[0]
+                self.resyncs += 1
+                continue
+
+            # Frame not complete yet
+            if len(self._buffer) < length:
+                break
+
+            # Checked in place, the frame is only copied out once it is known to be good
+            with memoryview(self._buffer) as view:
+                with view[:length] as candidate:
+                    frame = bytearray(candidate) if crc_valid(candidate) else None
+
+            if frame is None:
+                self.crc_errors += 1
+                logging.debug(f"❌ CRC mismatch, resyncing: {self._buffer[:length].hex()}")
+                del self._buffer[0]
+                continue
+
+            del self._buffer[:length]
+            self.frames += 1
+            frames.append(frame)
+
+        if self._buffer:
+            self.fragments += 1
+
+        return frames
+
+    def reset(self) -> None:
+        """Discard any partial frame, e.g. after a reconnect"""
+        self._buffer.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the assembler counters
+
+        Returns:
+            dict: Counter values
+        """
+        return {
+            'notifications': self.notifications,
+            'frames': self.frames,
+            'fragments': self.fragments,
+            'resyncs': self.resyncs,
+            'crc_errors': self.crc_errors
+        }
+
+    def _expected_length(self) -> Optional[int]:
+        """
+        Work out the total length of the frame at the start of the buffer
+
+        Returns:
+            int length, 0 if the buffer does not start with a frame,
+            or None if more bytes are needed
+        """
+        if len(self._buffer) < 2:
+            return None
+
+        function_code = self._buffer[1]
+
+        if function_code & 0x80:
+            return EXCEPTION_FRAME_LENGTH
+
+        if function_code == ModbusFunction.READ:
+            if len(self._buffer) < READ_HEADER_LENGTH:
+                return None
+            return READ_HEADER_LENGTH + self._buffer[2] + CRC_LENGTH
+
+        return FIXED_FRAME_LENGTHS.get(function_code, 0)
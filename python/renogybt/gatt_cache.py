@@ -0,0 +1,110 @@
+"""
+Persistent cache of resolved GATT handles for Renogy devices
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from config.settings import GATT_CACHE_PATH
+
+class GattCache:
+    """
+    Small on-disk cache of the notify/write handles resolved for each device,
+    keyed by MAC address, so reconnects can skip the characteristic walk
+    """
+
+    def __init__(self, path: str = GATT_CACHE_PATH):
+        """
+        Initialize the cache
+
+        Args:
+            path: Location of the JSON cache file
+        """
+        self.path = path
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def get(self, mac_address: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached handles for a device
+
+        Args:
+            mac_address: MAC address of the device
+
+        Returns:
+            dict with service_uuid, notify_handle and write_handle, or None
+        """
+        return self._load().get(mac_address.upper())
+
+    def put(self, mac_address: str, service_uuid: str, notify_handle: int, write_handle: int) -> None:
+        """
+        Store the resolved handles for a device
+
+        Args:
+            mac_address: MAC address of the device
+            service_uuid: UUID of the write service
+            notify_handle: Handle of the notify characteristic
+            write_handle: Handle of the write characteristic
+        """
+        entry = {
+            'service_uuid': service_uuid,
+            'notify_handle': notify_handle,
+            'write_handle': write_handle
+        }
+
+        entries = self._load()
+        if entries.get(mac_address.upper()) != entry:
+            entries[mac_address.upper()] = entry
+            self._save()
+
+    def invalidate(self, mac_address: str) -> None:
+        """
+        Drop the cached handles for a device
+
+        Args:
+            mac_address: MAC address of the device
+        """
+        entries = self._load()
+        if entries.pop(mac_address.upper(), None) is not None:
+            logging.info(f"🗑️ Invalidated GATT cache for {mac_address}")
+            self._save()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the cache file on first use"""
+        if self._entries is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logging.warning(f"⚠️ Ignoring unreadable GATT cache {self.path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        """Write the cache file atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not write GATT cache {self.path}: {e}")
+
+# Shared cache instance
+_shared_cache = None
+
+def get_gatt_cache() -> GattCache:
+    """
+    Get the process-wide GATT handle cache
+
+    Returns:
+        GattCache: The shared cache instance
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = GattCache()
+    return _shared_cache
@@ -0,0 +1,195 @@
+"""
+Connection state machine with jittered backoff and a circuit breaker
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Dict
+
+from config.settings import (
+    RECONNECT_BASE_DELAY,
+    RECONNECT_MAX_DELAY,
+    RECONNECT_CIRCUIT_THRESHOLD,
+    RECONNECT_OPEN_CIRCUIT_DELAY
+)
+
+# Default configuration
+DEFAULT_DEGRADED_THRESHOLD = 3  # consecutive poll errors before a link counts as degraded
+DEFAULT_HISTORY_SIZE = 50
+MIN_BACKOFF_DELAY = 0.1  # seconds - shortest jittered backoff, so a reconnect never races the teardown
+
+class LinkState:
+    DISCONNECTED = 'disconnected'
+    CONNECTED = 'connected'
+    DEGRADED = 'degraded'
+    BACKING_OFF = 'backing_off'
+    OPEN_CIRCUIT = 'open_circuit'
+    PROBING = 'probing'
+
+class ConnectionStateMachine:
+    """
+    Tracks the state of one device link and decides how long to wait
+    before the next connection attempt
+
+    Failed attempts back off exponentially with full jitter up to
+    max_delay. After failure_threshold consecutive failures the circuit
+    opens and attempts continue forever at open_circuit_delay.
+    """
+
+    def __init__(self, name: str,
+                 base_delay: float = RECONNECT_BASE_DELAY,
+                 max_delay: float = RECONNECT_MAX_DELAY,
+                 failure_threshold: int = RECONNECT_CIRCUIT_THRESHOLD,
+                 open_circuit_delay: float = RECONNECT_OPEN_CIRCUIT_DELAY,
+                 degraded_threshold: int = DEFAULT_DEGRADED_THRESHOLD,
+                 history_size: int = DEFAULT_HISTORY_SIZE):
+        """
+        Initialize the state machine
+
+        Args:
+            name: Name of the device for logging
+            base_delay: First backoff delay in seconds
+            max_delay: Cap on the backoff delay in seconds
+            failure_threshold: Consecutive failures before the circuit opens
+            open_circuit_delay: Delay between probes while the circuit is open
+            degraded_threshold: Consecutive poll errors before a link is degraded
+            history_size: Number of transitions to keep
+        """
+        self.name = name
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.open_circuit_delay = open_circuit_delay
+        self.degraded_threshold = degraded_threshold
+
+        self.state = LinkState.DISCONNECTED
+        self.consecutive_failures = 0
+        self.consecutive_errors = 0
+        self.state_since = time.time()
+        self.history = deque(maxlen=history_size)
+
+    def record_connected(self) -> None:
+        """A connection attempt succeeded"""
+        self.consecutive_failures = 0
+        self.consecutive_errors = 0
+        self._transition(LinkState.CONNECTED, 'connected')
+
+    def record_failure(self, reason: str) -> None:
+        """
+        A connection attempt failed
+
+        Args:
+            reason: Why the attempt failed
+        """
+        self.consecutive_failures += 1
+
+        if self.consecutive_failures >= self.failure_threshold:
+            self._transition(LinkState.OPEN_CIRCUIT, reason)
+        else:
+            self._transition(LinkState.BACKING_OFF, reason)
+
+    def record_disconnect(self, reason: str) -> None:
+        """
+        An established link was lost
+
+        Args:
+            reason: Why the link was lost
+        """
+        if self.state in (LinkState.CONNECTED, LinkState.DEGRADED, LinkState.DISCONNECTED):
+            self._transition(LinkState.BACKING_OFF, reason)
+
+    def record_closed(self) -> None:
+        """The link was closed on purpose"""
+        self.consecutive_errors = 0
+        if self.state in (LinkState.CONNECTED, LinkState.DEGRADED):
+            self._transition(LinkState.DISCONNECTED, 'closed')
+
+    def record_poll(self, success: bool, reason: str = None) -> None:
+        """
+        Record the outcome of a request on an established link
+
+        Args:
+            success: Whether the request succeeded
+            reason: Why the request failed
+        """
+        if success:
+            self.consecutive_errors = 0
+            if self.state == LinkState.DEGRADED:
+                self._transition(LinkState.CONNECTED, 'recovered')
+            return
+
+        self.consecutive_errors += 1
+        if self.state == LinkState.CONNECTED and self.consecutive_errors >= self.degraded_threshold:
+            self._transition(LinkState.DEGRADED, reason or 'repeated errors')
+
+    def next_delay(self) -> float:
+        """
+        Get the delay before the next connection attempt
+
+        Returns:
+            float: Delay in seconds
+        """
+        if self.state == LinkState.OPEN_CIRCUIT:
+            # Spread probes a little so devices don't probe in lockstep
+            return self.open_circuit_delay * random.uniform(0.8, 1.2)
+
+        # Full jitter exponential backoff: anywhere up to the ceiling, so links that dropped together spread out
+        ceiling = min(self.max_delay, self.base_delay * (2 ** self.consecutive_failures))
+        return random.uniform(min(MIN_BACKOFF_DELAY, ceiling), ceiling)
+
+    @property
+    def backing_off(self) -> bool:
+        """Whether the next connection attempt has to wait out a backoff delay first"""
+        return self.state in (LinkState.BACKING_OFF, LinkState.OPEN_CIRCUIT)
+
+    async def wait(self) -> None:
+        """Wait out the backoff delay, then move to probing"""
+        delay = self.next_delay()
+        logging.info(f"⏳ {self.name} {self.state}, next attempt in {delay:.1f}s")
+        await asyncio.sleep(delay)
+        self.start_probe()
+
+    def start_probe(self) -> None:
+        """A connection attempt is starting"""
+        if self.state != LinkState.CONNECTED:
+            self._transition(LinkState.PROBING, 'connection attempt')
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the current state and transition history
+
+        Returns:
+            dict: State, counters and history
+        """
+        return {
+            'state': self.state,
+            'since': self.state_since,
+            'consecutive_failures': self.consecutive_failures,
+            'consecutive_errors': self.consecutive_errors,
+            'history': list(self.history)
+        }
+
+    def _transition(self, new_state: str, reason: str) -> None:
+        """
+        Move to a new state and record the transition
+
+        Args:
+            new_state: State to move to
+            reason: Why the transition happened
+        """
+        if new_state == self.state:
+            return
+
+        now = time.time()
+        self.history.append({
+            'time': now,
+            'from': self.state,
+            'to': new_state,
+            'reason': reason
+        })
+        logging.info(f"🔀 {self.name}: {self.state} → {new_state} ({reason})")
+        self.state = new_state
+        self.state_since = now
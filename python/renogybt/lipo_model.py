@@ -5,6 +5,8 @@ Simplified LipoModel for calculating battery metrics and time estimates
 import logging
 from typing import Dict, Any, Optional
 
+from .snapshots import RoverSnapshot, BatterySnapshot
+
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
@@ -20,16 +22,16 @@ class LipoModel:
         self.charge_efficiency = 0.9  # Typical LiPo charging efficiency
         self.max_depth_of_discharge = 0.95  # Maximum safe DoD for LiPo batteries
 
-    def calculate(self, dcdc_data: Dict[str, Any], battery_data: Dict[str, Any]) -> Dict[str, Any]:
+    def calculate(self, dcdc_data: RoverSnapshot, battery_data: BatterySnapshot) -> Dict[str, Any]:
         """
-        Calculate derived metrics from raw device data
+        Calculate derived metrics from device snapshots
 
         Args:
-            dcdc_data: Data from the DCDC controller
-            battery_data: Data from the Battery
+            dcdc_data: Snapshot from the DCDC controller
+            battery_data: Snapshot from the Battery
 
         Returns:
-            dict: Combined data with calculated metrics
+            dict: Combined data with calculated metrics, in the wire format
         """
         if not dcdc_data or not battery_data:
             return {'error': 'Insufficient data'}
@@ -48,50 +50,40 @@ class LipoModel:
             log.error(f"❌ Error in LipoModel calculation: {e}")
             return {'error': f'Calculation error: {str(e)}'}
 
-    def _combine_device_data(self, dcdc_data: Dict[str, Any], battery_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _combine_device_data(self, dcdc_data: RoverSnapshot, battery_data: BatterySnapshot) -> Dict[str, Any]:
         """
-        Combine data from both devices into a single data structure
+        Combine both device snapshots into a single wire-format dict
         """
-        combined = {}
-
-        # Add DCDC data
-        combined['pv_power'] = dcdc_data.get('pv_power', 0)
-        combined['pv_current'] = dcdc_data.get('pv_current', 0)
-        combined['load_power'] = dcdc_data.get('load_power', 0)
-        combined['load_current'] = dcdc_data.get('load_current', 0)
-        combined['charger_status'] = dcdc_data.get('charging_status', 'unknown')
-        combined['power_generation_today'] = dcdc_data.get('power_generation_today', 0)
-
-        # Add battery data
-        combined['battery_voltage'] = battery_data.get('voltage', 0)
-        combined['battery_current'] = battery_data.get('current', 0)
-        combined['battery_status'] = battery_data.get('status', 'unknown')
-        combined['battery_percentage'] = battery_data.get('remaining_charge', 0)
-        combined['battery_capacity'] = battery_data.get('capacity', 0)
-        combined['battery_power'] = battery_data.get('power', 0)
-        combined['cell_count'] = battery_data.get('cell_count', 0)
-        combined['sensor_count'] = battery_data.get('sensor_count', 0)
-
-        # Add calculated battery metrics
-        combined['min_cell_voltage'] = battery_data.get('min_cell_voltage', 0)
-        combined['max_cell_voltage'] = battery_data.get('max_cell_voltage', 0)
-        combined['cell_voltage_diff'] = battery_data.get('cell_voltage_diff', 0)
-        combined['min_temperature'] = battery_data.get('min_temperature', 0)
-        combined['max_temperature'] = battery_data.get('max_temperature', 0)
-
-        # Add all cell voltage values
-        for i in range(battery_data.get('cell_count', 0)):
-            cell_key = f'cell_voltage_{i}'
-            if cell_key in battery_data:
-                combined[cell_key] = battery_data[cell_key]
-
-        # Add all temperature sensor values
-        for i in range(battery_data.get('sensor_count', 0)):
-            temp_key = f'temperature_{i}'
-            if temp_key in battery_data:
-                combined[temp_key] = battery_data[temp_key]
-
-        return combined
+        return {
+            # DCDC data
+            'pv_power': dcdc_data.pv_power or 0,
+            'pv_current': dcdc_data.pv_current or 0,
+            'load_power': dcdc_data.load_power or 0,
+            'load_current': dcdc_data.load_current or 0,
+            'charger_status': dcdc_data.charging_status or 'unknown',
+            'power_generation_today': dcdc_data.power_generation_today or 0,
+
+            # Battery data
+            'battery_voltage': battery_data.voltage or 0,
+            'battery_current': battery_data.current or 0,
+            'battery_status': battery_data.status or 'unknown',
+            'battery_percentage': battery_data.remaining_charge or 0,
+            'battery_capacity': battery_data.capacity or 0,
+            'battery_power': battery_data.power or 0,
+            'cell_count': battery_data.cell_count,
+            'sensor_count': battery_data.sensor_count,
+
+            # Calculated battery metrics
+            'min_cell_voltage': battery_data.min_cell_voltage or 0,
+            'max_cell_voltage': battery_data.max_cell_voltage or 0,
+            'cell_voltage_diff': battery_data.cell_voltage_diff or 0,
+            'min_temperature': battery_data.min_temperature or 0,
+            'max_temperature': battery_data.max_temperature or 0,
+
+            # Per-cell voltages and per-sensor temperatures, index = cell/sensor number
+            'cell_voltages': battery_data.cell_voltage_list(),
+            'temperatures': battery_data.temperature_list()
+        }
 
     def _estimate_charging_time(self, data: Dict[str, Any]) -> str:
         """
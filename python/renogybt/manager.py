@@ -3,10 +3,44 @@ Device manager for multiple Renogy BT devices
 """
 
 import asyncio
+import functools
 import logging
-from typing import Dict, List, Callable, Any, Optional
+import time
+from typing import Dict, List, Callable, Any, Optional, Set
 
 from .device import Device
+from .notify_queue import NotificationQueue, Overflow
+from config.settings import BLE_MAX_CONCURRENT_CONNECTIONS, HANDLER_SLOW_THRESHOLD, HANDLER_QUEUE_SIZE
+
+class HandlerStats:
+    """
+    Call counters and latency for one data or error handler
+    """
+
+    __slots__ = ('calls', 'failures', 'slow', 'total_time', 'max_time')
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.slow = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def record(self, duration: float) -> None:
+        """Record a finished call"""
+        self.calls += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counters with latencies in milliseconds"""
+        return {
+            'calls': self.calls,
+            'failures': self.failures,
+            'slow': self.slow,
+            'mean_ms': round(self.total_time / self.calls * 1000, 1) if self.calls else None,
+            'max_ms': round(self.max_time * 1000, 1)
+        }
 
 class DeviceManager:
     """
@@ -18,7 +52,12 @@ class DeviceManager:
         self.devices = {}
         self.data_handlers = []
         self.error_handlers = []
+        self.slow_threshold = HANDLER_SLOW_THRESHOLD
+        self._device_keys = {}  # device -> key, so callbacks find their key without a scan
+        self._handler_stats = {}  # handler -> HandlerStats
+        self._handler_queues = {}  # handler -> NotificationQueue of its pending events, drained by its own task
         self.connecting = False
+        self._connect_semaphores = {}  # adapter -> semaphore limiting parallel connects
 
     async def add_device(self, device_key: str, device: Device) -> bool:
         """
@@ -42,19 +81,25 @@ class DeviceManager:
 
         # Add device to collection
         self.devices[device_key] = device
+        self._device_keys[device] = device_key
         logging.info(f"➕ Added device to manager: {device_key}")
         return True
 
-    async def connect_all_devices(self, max_attempts: int = 3) -> bool:
+    async def connect_all_devices(self, max_attempts: int = 3, concurrent: bool = False) -> bool:
         """
         Connect all managed devices
 
         Args:
             max_attempts: Maximum connection attempts per device
+            concurrent: Connect devices in parallel (bounded per adapter)
 
         Returns:
             bool: True if all devices connected successfully
         """
+        if concurrent:
+            results = await self.connect_devices(max_attempts)
+            return bool(results) and all(results.values())
+
         if not self.devices:
             logging.warning("🔍 No devices to connect")
             return False
@@ -68,6 +113,9 @@ class DeviceManager:
         try:
             logging.info(f"🔌 Connecting {len(self.devices)} devices...")
 
+            # Keep the advertisement caches warm so discovery is instant
+            await self._start_scanners()
+
             # Connect each device sequentially
             all_connected = True
             for device_key, device in self.devices.items():
@@ -89,9 +137,77 @@ class DeviceManager:
         finally:
             self.connecting = False
 
+    async def connect_devices(self, max_attempts: int = 3,
+                              max_concurrency: int = BLE_MAX_CONCURRENT_CONNECTIONS,
+                              on_result: Callable = None) -> Dict[str, bool]:
+        """
+        Connect all managed devices concurrently, bounded per adapter
+
+        Args:
+            max_attempts: Maximum connection attempts per device
+            max_concurrency: Maximum parallel connection attempts per adapter
+            on_result: Optional callback(device_key, device, connected) awaited
+                as soon as each device finishes
+
+        Returns:
+            dict: Device key to connection result
+        """
+        results = {}
+
+        if not self.devices:
+            logging.warning("🔍 No devices to connect")
+            return results
+
+        if self.connecting:
+            logging.info("⏳ Already connecting devices")
+            return results
+
+        self.connecting = True
+
+        try:
+            logging.info(f"🔌 Connecting {len(self.devices)} devices concurrently "
+                         f"(max {max_concurrency} per adapter)...")
+
+            # Keep the advertisement caches warm so discovery is instant
+            await self._start_scanners()
+
+            async def connect_one(device_key: str, device: Device) -> None:
+                semaphore = self._get_connect_semaphore(device, max_concurrency)
+
+                async with semaphore:
+                    logging.info(f"🔄 Connecting device: {device_key}")
+                    try:
+                        connected = await device.connect(max_attempts)
+                    except Exception as e:
+                        logging.error(f"❌ Error connecting to {device_key}: {e}")
+                        connected = False
+
+                results[device_key] = connected
+
+                if connected:
+                    logging.info(f"✅ Device {device_key} connected successfully")
+                else:
+                    logging.warning(f"❗ Failed to connect to {device_key}")
+
+                if on_result:
+                    try:
+                        await on_result(device_key, device, connected)
+                    except Exception as e:
+                        logging.error(f"❌ Error in connect result callback: {e}")
+
+            await asyncio.gather(*(connect_one(k, d) for k, d in self.devices.items()))
+
+            connected_count = sum(1 for connected in results.values() if connected)
+            logging.info(f"🔌 Connected {connected_count}/{len(results)} devices")
+            return results
+
+        finally:
+            self.connecting = False
+
     async def start_polling(self, sequential_delay: float = 2.0) -> bool:
         """
-        Start polling all connected devices
+        Start polling all devices, devices that are not connected yet keep
+        reconnecting from their polling loop
 
         Args:
             sequential_delay: Delay between starting polling for each device
@@ -99,33 +215,29 @@ class DeviceManager:
         Returns:
             bool: True if polling started for at least one device
         """
-        connected_devices = []
+        if not self.devices:
+            logging.warning("⚠️ No devices to poll")
+            return False
 
-        # Identify connected devices
         for device_key, device in self.devices.items():
             if device.connection.is_connected:
-                connected_devices.append((device_key, device))
                 logging.info(f"🟢 Device ready for polling: {device_key}")
             else:
-                logging.warning(f"🔴 Cannot poll device: {device_key} not connected")
-
-        if not connected_devices:
-            logging.warning("⚠️ No connected devices to poll")
-            return False
+                logging.warning(f"🔴 Device {device_key} not connected, polling will reconnect it")
 
         # Start polling each device sequentially
-        logging.info(f"🔄 Starting sequential polling for {len(connected_devices)} devices")
+        logging.info(f"🔄 Starting sequential polling for {len(self.devices)} devices")
 
-        for idx, (device_key, device) in enumerate(connected_devices):
+        for idx, (device_key, device) in enumerate(self.devices.items()):
             logging.info(f"📊 Starting polling for device: {device_key}")
             await device.start_polling()
 
             # Add delay between starting polling for each device
             # This prevents overwhelming the BLE stack
-            if idx < len(connected_devices) - 1:
+            if idx < len(self.devices) - 1:
                 await asyncio.sleep(sequential_delay)
 
-        logging.info(f"✅ Started polling for all {len(connected_devices)} devices")
+        logging.info(f"✅ Started polling for all {len(self.devices)} devices")
         return True
 
     async def stop(self) -> bool:
@@ -148,6 +260,10 @@ class DeviceManager:
             await asyncio.gather(*stop_tasks, return_exceptions=True)
             logging.info("⏹️ All devices stopped")
 
+        for scanner in self._get_scanners():
+            await scanner.stop()
+
+        await asyncio.gather(*(queue.stop() for queue in self._handler_queues.values()))
         return True
 
     def add_data_handler(self, handler: Callable) -> None:
@@ -155,10 +271,12 @@ class DeviceManager:
         Add a callback for device data updates
 
         Args:
-            handler: Callback function(device_key, device, data)
+            handler: Callback function(device_key, device, data, changed), where
+                changed is the set of fields that moved past their deadband
         """
         if handler not in self.data_handlers:
             self.data_handlers.append(handler)
+            self._handler_queue(handler)
 
     def remove_data_handler(self, handler: Callable) -> None:
         """
@@ -169,6 +287,8 @@ class DeviceManager:
         """
         if handler in self.data_handlers:
             self.data_handlers.remove(handler)
+            if handler not in self.error_handlers:
+                self._forget_handler(handler)
 
     def add_error_handler(self, handler: Callable) -> None:
         """
@@ -179,6 +299,7 @@ class DeviceManager:
         """
         if handler not in self.error_handlers:
             self.error_handlers.append(handler)
+            self._handler_queue(handler)
 
     def remove_error_handler(self, handler: Callable) -> None:
         """
@@ -189,24 +310,40 @@ class DeviceManager:
         """
         if handler in self.error_handlers:
             self.error_handlers.remove(handler)
+            if handler not in self.data_handlers:
+                self._forget_handler(handler)
 
-    async def _on_device_data(self, device: Device, data: Dict[str, Any]) -> None:
+    def get_handler_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get call counters and latency for each registered handler
+
+        Returns:
+            dict: Handler name to its counters, latencies in milliseconds
+        """
+        return {self._handler_name(handler): stats.to_dict() for handler, stats in self._handler_stats.items()}
+
+    def get_event_queue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get depth, drops and lag of the device events waiting for each handler
+
+        Returns:
+            dict: Handler name to its queue counters, times in milliseconds
+        """
+        return {self._handler_name(handler): queue.get_stats() for handler, queue in self._handler_queues.items()}
+
+    async def _on_device_data(self, device: Device, data: Dict[str, Any], changed: Set[str]) -> None:
         """
         Internal callback for device data
 
         Args:
             device: Source device
             data: Device data
+            changed: Fields that changed since the last callback
         """
-        device_key = next((k for k, v in self.devices.items() if v == device), None)
+        device_key = self._device_keys.get(device)
 
         if device_key:
-            # Call all registered data handlers
-            for handler in self.data_handlers:
-                try:
-                    await handler(device_key, device, data)
-                except Exception as e:
-                    logging.error(f"❌ Error in data handler: {e}")
+            self._dispatch(self.data_handlers, device_key, device, data, changed)
 
     async def _on_device_error(self, device: Device, error: str) -> None:
         """
@@ -216,15 +353,109 @@ class DeviceManager:
             device: Source device
             error: Error message
         """
-        device_key = next((k for k, v in self.devices.items() if v == device), None)
+        device_key = self._device_keys.get(device)
 
         if device_key:
-            # Call all registered error handlers
-            for handler in self.error_handlers:
-                try:
-                    await handler(device_key, device, error)
-                except Exception as e:
-                    logging.error(f"❌ Error in error handler: {e}")
+            self._dispatch(self.error_handlers, device_key, device, error)
+
+    def _dispatch(self, handlers: List[Callable], *args: Any) -> None:
+        """
+        Queue a device event for each handler and return at once, so the
+        polling task that raised it never waits on a handler
+
+        Args:
+            handlers: Handlers to call
+            *args: Arguments passed to each handler
+        """
+        for handler in handlers:
+            self._handler_queue(handler).put(args)
+
+    def _handler_queue(self, handler: Callable) -> NotificationQueue:
+        """
+        Get the queue feeding a handler, creating it on first use
+
+        Each handler drains its own queue, so a slow or stuck handler only
+        backs up (and eventually drops) its own events.
+        """
+        queue = self._handler_queues.get(handler)
+        if queue is None:
+            self._handler_stats.setdefault(handler, HandlerStats())
+            queue = NotificationQueue(f"Handler {self._handler_name(handler)}",
+                                      functools.partial(self._call_handler, handler),
+                                      maxsize=HANDLER_QUEUE_SIZE, overflow=Overflow.DROP_OLDEST)
+            self._handler_queues[handler] = queue
+        return queue
+
+    def _forget_handler(self, handler: Callable) -> None:
+        """Drop a removed handler's stats and stop its queue"""
+        self._handler_stats.pop(handler, None)
+        queue = self._handler_queues.pop(handler, None)
+        if queue is not None:
+            try:
+                asyncio.get_running_loop().create_task(queue.stop())
+            except RuntimeError:
+                pass  # No event loop, so no consumer task to stop either
+
+    async def _call_handler(self, handler: Callable, args: tuple) -> None:
+        """Call one handler to completion, recording its latency and outcome"""
+        stats = self._handler_stats.setdefault(handler, HandlerStats())
+        started_at = time.monotonic()
+
+        # Count a call as slow once it passes the threshold, even if it never finishes
+        def flag_slow():
+            stats.slow += 1
+            logging.warning(f"🐢 Handler {self._handler_name(handler)} still running after {self.slow_threshold}s")
+
+        watchdog = asyncio.get_running_loop().call_later(self.slow_threshold, flag_slow)
+
+        try:
+            await handler(*args)
+        except Exception as e:
+            stats.failures += 1
+            logging.error(f"❌ Error in handler {self._handler_name(handler)}: {e}")
+        finally:
+            watchdog.cancel()
+            stats.record(time.monotonic() - started_at)
+
+    @staticmethod
+    def _handler_name(handler: Callable) -> str:
+        """Readable name of a handler for logs and stats"""
+        return getattr(handler, '__qualname__', repr(handler))
+
+    def _get_connect_semaphore(self, device: Device, max_concurrency: int) -> asyncio.Semaphore:
+        """
+        Get the connection semaphore for the adapter a device uses
+
+        Args:
+            device: Device about to connect
+            max_concurrency: Limit used when creating a new semaphore
+
+        Returns:
+            asyncio.Semaphore: Semaphore shared by devices on the same adapter
+        """
+        adapter = device.connection.adapter
+
+        if adapter not in self._connect_semaphores:
+            self._connect_semaphores[adapter] = asyncio.Semaphore(max(1, max_concurrency))
+        return self._connect_semaphores[adapter]
+
+    def _get_scanners(self) -> List[Any]:
+        """
+        Get the shared scanners for the adapters the devices use
+
+        Returns:
+            list: One scanner per adapter in use
+        """
+        scanners = []
+        for device in self.devices.values():
+            if device.connection.scanner not in scanners:
+                scanners.append(device.connection.scanner)
+        return scanners
+
+    async def _start_scanners(self) -> None:
+        """Start the shared scanner on every adapter in use"""
+        for scanner in self._get_scanners():
+            await scanner.start()
 
     def get_device(self, device_key: str) -> Optional[Device]:
         """
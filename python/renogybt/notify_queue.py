@@ -0,0 +1,136 @@
+"""
+Bounded queue between BLE notifications and frame handling
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict
+
+from config.settings import NOTIFY_QUEUE_SIZE, NOTIFY_QUEUE_OVERFLOW
+
+class Overflow:
+    DROP_OLDEST = 'drop_oldest'  # make room by discarding the longest-waiting frame
+    DROP_NEWEST = 'drop_newest'  # keep the backlog and discard the arriving frame
+
+class NotificationQueue:
+    """
+    Frames waiting to be handled, filled from the notification callback
+    without ever blocking it and drained by a single consumer task
+
+    Notifications are reassembled as they arrive, so a slow consumer never
+    loses a notification or splits a frame; once the queue is full, whole
+    frames are dropped according to the overflow policy and counted.
+    """
+
+    def __init__(self, name: str, handler: Callable[[bytearray], Awaitable[Any]],
+                 maxsize: int = NOTIFY_QUEUE_SIZE, overflow: str = NOTIFY_QUEUE_OVERFLOW):
+        """
+        Initialize the queue
+
+        Args:
+            name: Connection name for logging
+            handler: Coroutine function called with each frame, in arrival order
+            maxsize: Most frames waiting at once
+            overflow: What to drop when full (see Overflow)
+        """
+        if overflow not in (Overflow.DROP_OLDEST, Overflow.DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.name = name
+        self.handler = handler
+        self.maxsize = max(1, maxsize)
+        self.overflow = overflow
+
+        self._frames = deque()  # (frame, monotonic time queued), oldest first
+        self._ready = asyncio.Event()
+        self._task = None
+        self._overflowing = False  # whether frames have been dropped since the queue last drained
+
+        # Counters
+        self._queued = 0
+        self._handled = 0
+        self._dropped = 0
+        self._max_depth = 0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+
+    def put(self, frame: bytearray) -> None:
+        """
+        Queue a frame for the consumer, starting it if needed; never blocks
+
+        Args:
+            frame: Whole, CRC-checked frame
+        """
+        if len(self._frames) >= self.maxsize:
+            self._dropped += 1
+            # Warn once per backlog rather than once per frame, this runs in the notification callback
+            if not self._overflowing:
+                self._overflowing = True
+                logging.warning(f"🚮 {self.name} notification queue full ({self.maxsize}), "
+                                f"dropping {'new' if self.overflow == Overflow.DROP_NEWEST else 'oldest'} frames")
+            if self.overflow == Overflow.DROP_NEWEST:
+                return
+            self._frames.popleft()
+
+        self._frames.append((frame, time.monotonic()))
+        self._queued += 1
+        self._max_depth = max(self._max_depth, len(self._frames))
+        self._ready.set()
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop the consumer and discard frames still waiting"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._frames.clear()
+        self._ready.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and lag
+
+        Returns:
+            dict: Depth, counters, and time frames waited in milliseconds
+        """
+        lag = time.monotonic() - self._frames[0][1] if self._frames else 0.0
+        return {
+            'depth': len(self._frames),
+            'max_depth': self._max_depth,
+            'maxsize': self.maxsize,
+            'overflow': self.overflow,
+            'queued': self._queued,
+            'handled': self._handled,
+            'dropped': self._dropped,
+            'lag_ms': round(lag * 1000, 1),
+            'mean_lag_ms': round(self._lag_total / self._handled * 1000, 1) if self._handled else None,
+            'max_lag_ms': round(self._lag_max * 1000, 1)
+        }
+
+    async def _run(self) -> None:
+        """Consumer that hands queued frames to the handler one at a time"""
+        while True:
+            await self._ready.wait()
+
+            while self._frames:
+                frame, queued_at = self._frames.popleft()
+                lag = time.monotonic() - queued_at
+                self._lag_total += lag
+                self._lag_max = max(self._lag_max, lag)
+
+                try:
+                    await self.handler(frame)
+                except Exception as e:
+                    logging.error(f"❌ Error handling frame from {self.name}: {e}")
+                self._handled += 1
+
+            self._overflowing = False
+            self._ready.clear()
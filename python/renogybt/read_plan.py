@@ -0,0 +1,118 @@
+"""
+Read-plan compiler that merges register sections into fewer Modbus reads
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import MODBUS_MAX_READ_WORDS, MODBUS_MAX_READ_GAP
+
+READ_HEADER_LENGTH = 3  # device id, function, byte count
+
+class Refresh:
+    ONCE = 'once'  # static values, read once per connection
+    SLOW = 'slow'  # default max age SLOW_REFRESH_INTERVAL
+    LIVE = 'live'  # default max age POLL_INTERVAL
+
+class PlannedRead:
+    """
+    One Modbus read covering one or more register sections
+    """
+
+    __slots__ = ('register', 'words', 'sections', 'last_read')
+
+    def __init__(self, register: int, words: int, sections: List[Tuple[Dict[str, Any], int]]):
+        """
+        Initialize the read
+
+        Args:
+            register: First register read
+            words: Number of words read
+            sections: (section, word offset into this read) for each section covered
+        """
+        self.register = register
+        self.words = words
+        self.sections = sections
+        self.last_read = None  # monotonic time of the last successful read
+
+    @property
+    def refresh(self) -> str:
+        """Refresh class shared by the sections in this read"""
+        return self.sections[0][0].get('refresh', Refresh.LIVE)
+
+    @property
+    def max_age(self) -> Optional[float]:
+        """Tightest max age of the sections in this read, None if they are static"""
+        ages = [section['max_age'] for section, _ in self.sections if section.get('max_age') is not None]
+        return min(ages) if ages else None
+
+    @property
+    def merged(self) -> bool:
+        """Whether this read covers more than one section"""
+        return len(self.sections) > 1
+
+    def split(self, frame: bytearray) -> Iterator[Tuple[Dict[str, Any], bytearray]]:
+        """
+        Split a response back into per-section frames
+
+        Each section frame has the original device id and function code,
+        the section's byte count and the section's slice of the payload,
+        so existing parsers can use their usual offsets.
+
+        Args:
+            frame: Response to this read
+
+        Yields:
+            (section, section frame) for each section covered
+        """
+        if not self.merged:
+            section, _ = self.sections[0]
+            yield section, frame
+            return
+
+        for section, offset in self.sections:
+            start = READ_HEADER_LENGTH + offset * 2
+            length = section['words'] * 2
+            section_frame = bytearray((frame[0], frame[1], length))
+            section_frame += frame[start:start + length]
+            yield section, section_frame
+
+    def __repr__(self) -> str:
+        registers = ', '.join(str(section['register']) for section, _ in self.sections)
+        return f"PlannedRead(reg={self.register}, words={self.words}, sections=[{registers}])"
+
+def compile_read_plan(sections: List[Dict[str, Any]],
+                      max_words: int = MODBUS_MAX_READ_WORDS,
+                      max_gap: int = MODBUS_MAX_READ_GAP) -> List[PlannedRead]:
+    """
+    Merge adjacent and nearly adjacent sections into the fewest reads,
+    only merging sections with the same refresh class
+
+    Args:
+        sections: Sections with 'register' and 'words'
+        max_words: Largest number of words in a single read
+        max_gap: Largest number of unused words allowed between merged sections
+
+    Returns:
+        list: Planned reads in register order
+    """
+    plan = []
+    current = None
+
+    for section in sorted(sections, key=lambda s: s['register']):
+        register = section['register']
+        end = register + section['words']
+
+        if current is not None:
+            current_end = current.register + current.words
+            new_words = max(current_end, end) - current.register
+
+            if (register - current_end <= max_gap and new_words <= max_words and
+                    section.get('refresh', Refresh.LIVE) == current.refresh):
+                current.sections.append((section, register - current.register))
+                current.words = new_words
+                continue
+
+        current = PlannedRead(register, section['words'], [(section, 0)])
+        plan.append(current)
+
+    return plan
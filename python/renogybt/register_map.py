@@ -0,0 +1,156 @@
+"""
+Declarative register maps decoded with a single precompiled struct
+"""
+
+import struct
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# struct codes by (width in bytes, signed)
+STRUCT_CODES = {
+    (1, False): 'B', (1, True): 'b',
+    (2, False): 'H', (2, True): 'h',
+    (4, False): 'I', (4, True): 'i'
+}
+
+class Field:
+    """
+    One value in a response frame
+    """
+
+    __slots__ = ('name', 'offset', 'width', 'signed', 'scale', 'enum', 'shift', 'convert')
+
+    def __init__(self, name: str, offset: int, width: int = 2, signed: bool = False, scale: float = 1,
+                 enum: Dict[int, Any] = None, shift: int = 0, convert: Callable[[int], Any] = None):
+        """
+        Initialize the field
+
+        Args:
+            name: Attribute (or key) the decoded value is stored under
+            offset: Byte offset into the response frame, counting the 3-byte header
+            width: Size in bytes (1, 2 or 4), big-endian
+            signed: Whether the value is two's complement
+            scale: Multiplier applied to the raw value, rounded to 2 decimals like bytes_to_int
+            enum: Table mapping raw values to labels ('unknown' if missing)
+            shift: Bits to shift the raw value right by before scaling or lookup
+            convert: Function applied to the raw value instead of scale/enum
+        """
+        if (width, signed) not in STRUCT_CODES:
+            raise ValueError(f"Unsupported width {width} for field {name}")
+
+        self.name = name
+        self.offset = offset
+        self.width = width
+        self.signed = signed
+        self.scale = scale
+        self.enum = enum
+        self.shift = shift
+        self.convert = convert
+
+    def converter(self) -> Optional[Callable[[int], Any]]:
+        """
+        Build the function turning this field's raw value into its decoded value
+
+        Returns:
+            callable, or None when the raw value is used as is
+        """
+        shift, scale, enum, convert = self.shift, self.scale, self.enum, self.convert
+
+        if convert:
+            return (lambda raw: convert(raw >> shift)) if shift else convert
+        if enum is not None:
+            return lambda raw: enum.get(raw >> shift, 'unknown')
+        if scale != 1:
+            return lambda raw: round((raw >> shift) * scale, 2)
+        if shift:
+            return lambda raw: raw >> shift
+        return None
+
+class RegisterMap:
+    """
+    Fields of a response frame compiled into one struct.Struct, so a frame is
+    decoded with a single unpack_from instead of a slice per field
+    """
+
+    def __init__(self, fields: List[Field]):
+        """
+        Compile the map
+
+        Args:
+            fields: Fields to decode, in any order; they may not overlap
+
+        Raises:
+            ValueError: If two fields overlap
+        """
+        self.fields = sorted(fields, key=lambda field: field.offset)
+
+        layout = ['>']
+        position = 0
+        for field in self.fields:
+            if field.offset < position:
+                raise ValueError(f"Field {field.name} at offset {field.offset} overlaps the previous field")
+            if field.offset > position:
+                layout.append(f'{field.offset - position}x')
+            layout.append(STRUCT_CODES[(field.width, field.signed)])
+            position = field.offset + field.width
+
+        self.struct = struct.Struct(''.join(layout))
+        self._converters: List[Tuple[str, Optional[Callable[[int], Any]]]] = [
+            (field.name, field.converter()) for field in self.fields
+        ]
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Names of the decoded fields, in frame order"""
+        return tuple(name for name, _ in self._converters)
+
+    @property
+    def size(self) -> int:
+        """Shortest frame the map can decode"""
+        return self.struct.size
+
+    def decode(self, frame: bytearray) -> Dict[str, Any]:
+        """
+        Decode a frame into a dict
+
+        Args:
+            frame: Response frame
+
+        Returns:
+            dict: Field name to decoded value
+
+        Raises:
+            struct.error: If the frame is shorter than the map
+        """
+        return {
+            name: convert(raw) if convert else raw
+            for (name, convert), raw in zip(self._converters, self.struct.unpack_from(frame))
+        }
+
+    def decode_into(self, frame: bytearray, target: Any) -> None:
+        """
+        Decode a frame straight into attributes of a snapshot
+
+        Args:
+            frame: Response frame
+            target: Object whose attributes are set, e.g. a RoverSnapshot
+
+        Raises:
+            struct.error: If the frame is shorter than the map
+        """
+        for (name, convert), raw in zip(self._converters, self.struct.unpack_from(frame)):
+            setattr(target, name, convert(raw) if convert else raw)
+
+@lru_cache(maxsize=None)
+def word_array(count: int, signed: bool = False) -> struct.Struct:
+    """
+    Get a compiled struct for a run of 16-bit words, e.g. per-cell voltages
+
+    Args:
+        count: Number of words
+        signed: Whether the words are two's complement
+
+    Returns:
+        struct.Struct: Big-endian struct, cached per count and signedness
+    """
+    return struct.Struct(f'>{count}{STRUCT_CODES[(2, signed)]}')
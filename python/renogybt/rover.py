@@ -6,14 +6,61 @@ import logging
 from typing import Dict, Any, Optional
 
 from .device import Device
-from .utils import bytes_to_int, parse_temperature, CHARGING_STATES, LOAD_STATES, BATTERY_TYPES
+from .read_plan import Refresh
+from .register_map import Field, RegisterMap
+from .snapshots import RoverSnapshot
+from .utils import parse_temperature, CHARGING_STATES, LOAD_STATES, BATTERY_TYPES
 from config.settings import TEMPERATURE_UNIT
 
+DEVICE_ADDRESS = RegisterMap([Field('device_id', 4, width=1)])
+
+# Register 256 block: battery, controller, load, PV and daily stats
+CHARGING_INFO = RegisterMap([
+    # Battery info
+    Field('battery_percentage', 3),
+    Field('battery_voltage', 5, scale=0.1),
+    Field('battery_current', 7, scale=0.01),
+    Field('controller_temperature', 9, width=1, convert=parse_temperature),
+    Field('battery_temperature', 10, width=1, convert=parse_temperature),
+
+    # Load info
+    Field('load_voltage', 11, scale=0.1),
+    Field('load_current', 13, scale=0.01),
+    Field('load_power', 15),
+
+    # PV (solar) info
+    Field('pv_voltage', 17, scale=0.1),
+    Field('pv_current', 19, scale=0.01),
+    Field('pv_power', 21),
+
+    # Daily stats
+    Field('max_charging_power_today', 33),
+    Field('max_discharging_power_today', 35),
+    Field('charging_amp_hours_today', 37),
+    Field('discharging_amp_hours_today', 39),
+    Field('power_generation_today', 41),
+    Field('power_consumption_today', 43),
+
+    # Total stats
+    Field('power_generation_total', 59, width=4),
+
+    # Status: load on/off in the top bit, then the charging state
+    Field('load_status', 67, width=1, shift=7, enum=LOAD_STATES),
+    Field('charging_status', 68, width=1, enum=CHARGING_STATES)
+])
+
+# Temperatures decoded in Celsius by CHARGING_INFO
+TEMPERATURE_FIELDS = ('controller_temperature', 'battery_temperature')
+
+BATTERY_TYPE = RegisterMap([Field('battery_type', 3, enum=BATTERY_TYPES)])
+
 class RoverDevice(Device):
     """
     Specialized device implementation for Renogy Rover/Wanderer/Adventurer controllers
     """
 
+    snapshot_class = RoverSnapshot
+
     def __init__(self, mac_address: str, name: str = None, device_id: int = 1, **kwargs):
         """
         Initialize a Rover controller device
@@ -27,10 +74,14 @@ class RoverDevice(Device):
         self.temperature_unit = TEMPERATURE_UNIT
 
         # Define register sections to poll
-        self.add_section(register=12, word_count=8, parser=self.parse_device_info)
-        self.add_section(register=26, word_count=1, parser=self.parse_device_address)
-        self.add_section(register=256, word_count=34, parser=self.parse_charging_info)
-        self.add_section(register=57348, word_count=1, parser=self.parse_battery_type)
+        self.add_section(register=12, word_count=8, parser=self.parse_device_info, refresh=Refresh.ONCE,
+                         fields=('model',))
+        self.add_section(register=26, word_count=1, parser=self.parse_device_address, refresh=Refresh.ONCE,
+                         fields=DEVICE_ADDRESS.names)
+        self.add_section(register=256, word_count=34, parser=self.parse_charging_info, max_age=3,
+                         fields=CHARGING_INFO.names)
+        self.add_section(register=57348, word_count=1, parser=self.parse_battery_type, refresh=Refresh.ONCE,
+                         fields=BATTERY_TYPE.names)
 
     async def set_load(self, state: bool = False) -> bool:
         """
@@ -56,7 +107,7 @@ class RoverDevice(Device):
         # Extract model name (bytes 3-19)
         try:
             model = data[3:19].decode('utf-8').strip()
-            self.data['model'] = model
+            self.data.model = model
         except Exception as e:
             logging.error(f"❌ Error parsing device info: {e}")
 
@@ -68,7 +119,7 @@ class RoverDevice(Device):
             data: Raw response data
         """
         try:
-            self.data['device_id'] = bytes_to_int(data, 4, 1)
+            DEVICE_ADDRESS.decode_into(data, self.data)
         except Exception as e:
             logging.error(f"❌ Error parsing device address: {e}")
 
@@ -80,38 +131,11 @@ class RoverDevice(Device):
             data: Raw response data
         """
         try:
-            # Battery info
-            self.data['battery_percentage'] = bytes_to_int(data, 3, 2)
-            self.data['battery_voltage'] = bytes_to_int(data, 5, 2, scale=0.1)
-            self.data['battery_current'] = bytes_to_int(data, 7, 2, scale=0.01)
-            self.data['battery_temperature'] = parse_temperature(bytes_to_int(data, 10, 1), self.temperature_unit)
-
-            # Controller info
-            self.data['controller_temperature'] = parse_temperature(bytes_to_int(data, 9, 1), self.temperature_unit)
-            self.data['charging_status'] = CHARGING_STATES.get(bytes_to_int(data, 68, 1), 'unknown')
-
-            # Load info
-            load_status_bit = bytes_to_int(data, 67, 1) >> 7
-            self.data['load_status'] = LOAD_STATES.get(load_status_bit, 'unknown')
-            self.data['load_voltage'] = bytes_to_int(data, 11, 2, scale=0.1)
-            self.data['load_current'] = bytes_to_int(data, 13, 2, scale=0.01)
-            self.data['load_power'] = bytes_to_int(data, 15, 2)
-
-            # PV (solar) info
-            self.data['pv_voltage'] = bytes_to_int(data, 17, 2, scale=0.1)
-            self.data['pv_current'] = bytes_to_int(data, 19, 2, scale=0.01)
-            self.data['pv_power'] = bytes_to_int(data, 21, 2)
-
-            # Daily stats
-            self.data['max_charging_power_today'] = bytes_to_int(data, 33, 2)
-            self.data['max_discharging_power_today'] = bytes_to_int(data, 35, 2)
-            self.data['charging_amp_hours_today'] = bytes_to_int(data, 37, 2)
-            self.data['discharging_amp_hours_today'] = bytes_to_int(data, 39, 2)
-            self.data['power_generation_today'] = bytes_to_int(data, 41, 2)
-            self.data['power_consumption_today'] = bytes_to_int(data, 43, 2)
-
-            # Total stats
-            self.data['power_generation_total'] = bytes_to_int(data, 59, 4)
+            CHARGING_INFO.decode_into(data, self.data)
+
+            if self.temperature_unit.strip().upper() != 'C':
+                for name in TEMPERATURE_FIELDS:
+                    setattr(self.data, name, getattr(self.data, name) * 9/5 + 32)
         except Exception as e:
             logging.error(f"❌ Error parsing charging info: {e}")
 
@@ -123,8 +147,7 @@ class RoverDevice(Device):
             data: Raw response data
         """
         try:
-            battery_type_code = bytes_to_int(data, 3, 2)
-            self.data['battery_type'] = BATTERY_TYPES.get(battery_type_code, 'unknown')
+            BATTERY_TYPE.decode_into(data, self.data)
         except Exception as e:
             logging.error(f"❌ Error parsing battery type: {e}")
 
@@ -143,7 +166,8 @@ class RoverDevice(Device):
             'pv_power', 'load_power', 'charging_status', 'load_status',
             'battery_temperature', 'controller_temperature'
         ]:
-            if key in self.data:
-                summary[key] = self.data[key]
+            value = getattr(self.data, key)
+            if value is not None:
+                summary[key] = value
 
-        return summary
\ No newline at end of file
+        return summary
@@ -0,0 +1,224 @@
+"""
+Shared BLE scanner with an advertisement cache for Renogy devices
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .transport import get_transport
+
+# Default configuration
+DEFAULT_ADVERTISEMENT_TTL = 120  # seconds
+DEFAULT_TARGETED_SCAN_TIMEOUT = 4  # seconds
+
+class Advertisement:
+    """
+    Most recent advertisement seen for a device
+    """
+
+    __slots__ = ('device', 'address', 'name', 'rssi', 'last_seen')
+
+    def __init__(self, device, address: str, name: Optional[str], rssi: Optional[int], last_seen: float):
+        self.device = device
+        self.address = address
+        self.name = name
+        self.rssi = rssi
+        self.last_seen = last_seen
+
+    @property
+    def age(self) -> float:
+        """Seconds since the advertisement was last seen"""
+        return time.monotonic() - self.last_seen
+
+class BleScanner:
+    """
+    Long-lived scanner that owns the adapter and keeps an indexed cache of
+    recent advertisements, so connections can be discovered without a full scan
+    """
+
+    def __init__(self, adapter: str = None, ttl: float = DEFAULT_ADVERTISEMENT_TTL):
+        """
+        Initialize the scanner
+
+        Args:
+            adapter: Bluetooth adapter to scan on, e.g. 'hci0' (default: system default)
+            ttl: Maximum age in seconds of a cached advertisement
+        """
+        self.adapter = adapter
+        self.ttl = ttl
+        self.running = False
+
+        self._scanner = None
+        self._by_address: Dict[str, Advertisement] = {}
+        self._by_name: Dict[str, Advertisement] = {}
+        self._waiters: List[Tuple[Callable[[Advertisement], bool], asyncio.Future]] = []
+        self._scan_lock = asyncio.Lock()
+
+    async def start(self) -> bool:
+        """
+        Start continuous scanning
+
+        Returns:
+            bool: True if the scanner is running
+        """
+        if self.running:
+            return True
+
+        try:
+            self._scanner = self._create_scanner()
+            await self._scanner.start()
+            self.running = True
+            logging.info(f"📡 Shared BLE scanner started on {self.adapter or 'default adapter'}")
+            return True
+        except Exception as e:
+            logging.error(f"❌ Error starting BLE scanner: {e}")
+            self._scanner = None
+            return False
+
+    async def stop(self) -> None:
+        """Stop continuous scanning"""
+        if not self.running:
+            return
+
+        self.running = False
+
+        try:
+            await self._scanner.stop()
+        except Exception as e:
+            logging.error(f"⚠️ Error stopping BLE scanner: {e}")
+
+        self._scanner = None
+        logging.info("⏹️ Shared BLE scanner stopped")
+
+    def lookup(self, address: str = None, name: str = None) -> Optional[Advertisement]:
+        """
+        Look up a device in the advertisement cache
+
+        Args:
+            address: MAC address (preferred)
+            name: Advertised local name
+
+        Returns:
+            Advertisement if a fresh entry is cached, otherwise None
+        """
+        entry = None
+
+        if address:
+            entry = self._by_address.get(address.upper())
+        if entry is None and name:
+            entry = self._by_name.get(name)
+
+        if entry is not None and entry.age > self.ttl:
+            return None
+
+        return entry
+
+    async def find(self, address: str = None, name: str = None,
+                   timeout: float = DEFAULT_TARGETED_SCAN_TIMEOUT) -> Optional[Advertisement]:
+        """
+        Find a device, answering from the cache when possible
+
+        On a cache miss this waits for the running scanner to see the device,
+        or runs a short targeted scan if the scanner is not running.
+
+        Args:
+            address: MAC address (preferred)
+            name: Advertised local name
+            timeout: Maximum time in seconds to wait on a cache miss
+
+        Returns:
+            Advertisement if the device was found, otherwise None
+        """
+        entry = self.lookup(address, name)
+        if entry is not None:
+            return entry
+
+        address = address.upper() if address else None
+
+        def matches(adv: Advertisement) -> bool:
+            return bool((address and adv.address == address) or (name and adv.name == name))
+
+        future = asyncio.get_event_loop().create_future()
+        waiter = (matches, future)
+        self._waiters.append(waiter)
+
+        try:
+            if self.running:
+                return await asyncio.wait_for(future, timeout)
+
+            # Only one targeted scan may own the adapter at a time
+            async with self._scan_lock:
+                entry = self.lookup(address, name)
+                if entry is not None:
+                    return entry
+
+                logging.info(f"🔍 Cache miss, running targeted scan for {address or name}")
+                scanner = self._create_scanner()
+                await scanner.start()
+                try:
+                    return await asyncio.wait_for(future, timeout)
+                finally:
+                    await scanner.stop()
+
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _create_scanner(self):
+        """Create a scanner bound to this adapter that feeds the cache"""
+        return get_transport().create_scanner(self._on_advertisement, self.adapter)
+
+    def _on_advertisement(self, device, advertisement_data) -> None:
+        """
+        Update the cache from an advertisement
+
+        Args:
+            device: BLEDevice that advertised
+            advertisement_data: Advertisement payload
+        """
+        if not device.address:
+            return
+
+        address = device.address.upper()
+        name = advertisement_data.local_name or device.name
+        name = name.strip() if name else None
+
+        entry = self._by_address.get(address)
+        if entry is None:
+            entry = Advertisement(device, address, name, advertisement_data.rssi, time.monotonic())
+            self._by_address[address] = entry
+        else:
+            entry.device = device
+            entry.rssi = advertisement_data.rssi
+            entry.last_seen = time.monotonic()
+            if name:
+                entry.name = name
+
+        if entry.name:
+            self._by_name[entry.name] = entry
+
+        # Wake up anyone waiting on this device
+        for matches, future in self._waiters:
+            if not future.done() and matches(entry):
+                future.set_result(entry)
+
+# Shared scanner instances, one per adapter
+_shared_scanners: Dict[Optional[str], BleScanner] = {}
+
+def get_shared_scanner(adapter: str = None) -> BleScanner:
+    """
+    Get the process-wide shared scanner for an adapter
+
+    Args:
+        adapter: Bluetooth adapter name (default: system default)
+
+    Returns:
+        BleScanner: The shared scanner instance for the adapter
+    """
+    if adapter not in _shared_scanners:
+        _shared_scanners[adapter] = BleScanner(adapter)
+    return _shared_scanners[adapter]
@@ -0,0 +1,162 @@
+"""
+Deadline-based poll scheduler that keeps each register section within its
+target freshness
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Tuple
+
+from .read_plan import PlannedRead
+
+class PollScheduler:
+    """
+    Picks the planned read with the earliest deadline, where a read's deadline
+    is its last successful read plus its max age, starts it early enough to
+    land before the deadline, and paces reads so polling stays within an
+    airtime budget
+    """
+
+    READ_TIME_SMOOTHING = 0.2  # weight of the newest read in the read time average
+    LEAD_FACTOR = 2  # start reads this many average read times before the deadline
+
+    def __init__(self, plan: List[PlannedRead], airtime_budget: float, retry_delay: float):
+        """
+        Initialize the scheduler
+
+        Args:
+            plan: Planned reads, shared with the device so later changes are seen
+            airtime_budget: Largest fraction of time spent on poll reads (0-1]
+            retry_delay: Seconds before retrying a failed read
+        """
+        self.plan = plan
+        self.airtime_budget = airtime_budget
+        self.retry_delay = retry_delay
+
+        self._retry_at: Dict[int, float] = {}
+        self._next_slot = 0.0
+        self._read_time = 0.0
+        self._reads = 0
+        self._failures = 0
+        self._missed_deadlines = 0
+        self._max_lateness = 0.0
+        self._busy = 0.0
+        self._started_at = time.monotonic()
+
+    def deadline(self, planned: PlannedRead, connected_at: float) -> float:
+        """
+        Get the time a read is due
+
+        Reads not yet done on this connection are due immediately; static
+        reads (no max age) are never due again after that.
+
+        Args:
+            planned: The read
+            connected_at: Monotonic time the current connection was established
+
+        Returns:
+            float: Monotonic deadline, or infinity if the read is not due
+        """
+        if planned.last_read is None or planned.last_read < connected_at:
+            due = connected_at
+        elif planned.max_age is None:
+            return math.inf
+        else:
+            due = planned.last_read + planned.max_age
+
+        return max(due, self._retry_at.get(id(planned), 0.0))
+
+    def next_reads(self, connected_at: float, limit: int = 1) -> Tuple[List[PlannedRead], float]:
+        """
+        Pick the next reads, most urgent first
+
+        Args:
+            connected_at: Monotonic time the current connection was established
+            limit: Most reads to return, e.g. the connection's in-flight window
+
+        Returns:
+            (reads, seconds to wait before starting them); reads is empty if nothing is due
+        """
+        now = time.monotonic()
+        lead = self._read_time * self.LEAD_FACTOR
+
+        candidates = sorted(
+            (self.deadline(planned, connected_at), index, planned)
+            for index, planned in enumerate(self.plan)
+        )
+        candidates = [(deadline, planned) for deadline, _, planned in candidates if deadline != math.inf]
+
+        if not candidates:
+            return [], math.inf
+
+        start_at = max(candidates[0][0] - lead, self._next_slot)
+        if start_at > now:
+            return [candidates[0][1]], start_at - now
+
+        # Everything else already due goes out in the same batch, except reads the same
+        # size as one already in it: their replies could not be told apart
+        reads = []
+        sizes = set()
+        for deadline, planned in candidates:
+            if len(reads) >= limit or deadline - lead > now:
+                break
+            if planned.words not in sizes:
+                sizes.add(planned.words)
+                reads.append(planned)
+        return reads, 0.0
+
+    def record_read(self, planned: PlannedRead, started_at: float, success: bool, connected_at: float) -> None:
+        """
+        Record a finished read and reserve idle time to stay within the airtime budget
+
+        Args:
+            planned: The read
+            started_at: Monotonic time the read started
+            success: Whether the read returned data
+            connected_at: Monotonic time the current connection was established
+        """
+        now = time.monotonic()
+        duration = now - started_at
+
+        self._reads += 1
+        self._busy += duration
+        self._next_slot = now + duration * (1 - self.airtime_budget) / self.airtime_budget
+
+        if not success:
+            self._failures += 1
+            self._retry_at[id(planned)] = now + self.retry_delay
+            return
+
+        self._retry_at.pop(id(planned), None)
+
+        # Timeouts would inflate the lead time, so only successful reads count
+        if self._read_time:
+            self._read_time += (duration - self._read_time) * self.READ_TIME_SMOOTHING
+        else:
+            self._read_time = duration
+
+        # Only a refresh of data read earlier on this connection can miss its deadline
+        if planned.max_age is not None and planned.last_read is not None and planned.last_read >= connected_at:
+            lateness = now - (planned.last_read + planned.max_age)
+            if lateness > 0:
+                self._missed_deadlines += 1
+                self._max_lateness = max(self._max_lateness, lateness)
+
+        planned.last_read = now
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scheduling counters
+
+        Returns:
+            dict: Reads, failures, missed deadlines, worst lateness and airtime used
+        """
+        elapsed = time.monotonic() - self._started_at
+        return {
+            'reads': self._reads,
+            'failures': self._failures,
+            'missed_deadlines': self._missed_deadlines,
+            'max_lateness_ms': round(self._max_lateness * 1000, 1),
+            'mean_read_ms': round(self._read_time * 1000, 1),
+            'airtime': round(self._busy / elapsed, 3) if elapsed > 0 else 0.0
+        }
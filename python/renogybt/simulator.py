@@ -0,0 +1,440 @@
+"""
+In-process simulated Renogy BLE peripherals for hardware-free runs
+"""
+
+import asyncio
+import itertools
+import logging
+import random
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .connection import DEFAULT_NOTIFY_CHAR_UUID, DEFAULT_WRITE_CHAR_UUID, DEFAULT_WRITE_SERVICE_UUID
+from .codec import crc_valid, with_crc
+from .utils import ModbusFunction
+from config.settings import DCDC_CONFIG, BATTERY_CONFIG, SIMULATOR_CONFIG
+
+# Default configuration
+DEFAULT_NOTIFY_SERVICE_UUID = "0000fff0-0000-1000-8000-00805f9b34fb"
+DEFAULT_ADVERTISE_INTERVAL = 1.0  # seconds
+NOTIFY_HANDLE = 0x0011
+WRITE_HANDLE = 0x0015
+FRAGMENT_SPACING = 0.005  # seconds between fragments of one response
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_ADDRESS = 2
+ILLEGAL_DATA_VALUE = 3
+
+def _string_registers(start: int, text: str, words: int, pad: bytes = b' ') -> Dict[int, int]:
+    """Encode an ASCII string into consecutive registers"""
+    raw = text.encode('ascii')[:words * 2].ljust(words * 2, pad)
+    return {start + i: (raw[i * 2] << 8) | raw[i * 2 + 1] for i in range(words)}
+
+def rover_registers() -> Dict[int, int]:
+    """
+    Register map of a Rover/DCC charge controller
+
+    Returns:
+        dict: Register address to 16-bit value
+    """
+    registers = {}
+    registers.update(_string_registers(12, 'RBC30D1S-G1', 8))
+    registers[26] = 0x00FF
+
+    # Charging block, registers 256-289
+    registers.update({register: 0 for register in range(256, 290)})
+    registers.update({
+        256: 87,  # battery percentage
+        257: 134,  # battery voltage x10
+        258: 1250,  # battery current x100
+        259: (24 << 8) | 19,  # controller temperature, battery temperature
+        260: 0,  # load voltage x10
+        261: 0,  # load current x100
+        262: 0,  # load power
+        263: 192,  # pv voltage x10
+        264: 905,  # pv current x100
+        265: 174,  # pv power
+        271: 212,  # max charging power today
+        272: 0,  # max discharging power today
+        273: 38,  # charging amp hours today
+        274: 0,  # discharging amp hours today
+        275: 486,  # power generation today
+        276: 0,  # power consumption today
+        284: 0,  # power generation total (high word)
+        285: 51234,  # power generation total (low word)
+        288: 2  # load status bit 15, charging state in the low byte (mppt)
+    })
+
+    registers[57348] = 4  # lithium
+    return registers
+
+def battery_registers(cells: int = 4, sensors: int = 4) -> Dict[int, int]:
+    """
+    Register map of a Renogy LFP battery
+
+    Args:
+        cells: Number of cells
+        sensors: Number of temperature sensors
+
+    Returns:
+        dict: Register address to 16-bit value
+    """
+    registers = {register: 0 for register in range(5000, 5224)}
+
+    # Cell voltages x10
+    registers[5000] = cells
+    for i in range(cells):
+        registers[5001 + i] = 33
+
+    # Temperatures x10
+    registers[5017] = sensors
+    for i in range(sensors):
+        registers[5018 + i] = 185 + i * 5
+
+    remaining = 87250  # mAh
+    capacity = 100000  # mAh
+    registers.update({
+        5042: (-340) & 0xFFFF,  # current x100, signed
+        5043: 133,  # voltage x10
+        5044: remaining >> 16,
+        5045: remaining & 0xFFFF,
+        5046: capacity >> 16,
+        5047: capacity & 0xFFFF
+    })
+
+    registers.update(_string_registers(5122, 'RBT100LFP12S-G', 8, pad=b'\x00'))
+    registers[5223] = 0x00F7
+    return registers
+
+class SimulatedPeripheral:
+    """
+    A simulated Renogy BT module answering Modbus requests from a register map
+    """
+
+    def __init__(self, address: str, name: str, registers: Dict[int, int],
+                 device_id: int = 255, rssi: int = -62,
+                 latency: float = 0.08, jitter: float = 0.04, mtu: int = 20,
+                 drop_rate: float = 0.0, disconnect_rate: float = 0.0):
+        """
+        Initialize the peripheral
+
+        Args:
+            address: MAC address advertised by the peripheral
+            name: Advertised local name
+            registers: Register address to 16-bit value
+            device_id: Modbus device ID it answers to (255 answers to any)
+            rssi: Advertised signal strength in dBm
+            latency: Seconds from request to first notification
+            jitter: Seconds of random extra latency
+            mtu: Bytes per notification
+            drop_rate: Probability a notification is lost
+            disconnect_rate: Probability a request drops the link
+        """
+        self.address = address.upper()
+        self.name = name
+        self.registers = registers
+        self.device_id = device_id
+        self.rssi = rssi
+        self.latency = latency
+        self.jitter = jitter
+        self.mtu = mtu
+        self.drop_rate = drop_rate
+        self.disconnect_rate = disconnect_rate
+
+        # Counters
+        self.requests = 0
+        self.notifications = 0
+        self.dropped = 0
+        self.disconnects = 0
+
+    def handle_request(self, request: bytes) -> Optional[bytes]:
+        """
+        Answer a Modbus request
+
+        Args:
+            request: Request frame including CRC
+
+        Returns:
+            Response frame, or None if the request is ignored
+        """
+        self.requests += 1
+
+        if len(request) < 8 or not crc_valid(request):
+            logging.debug(f"🤖 {self.name} ignoring malformed request: {request.hex()}")
+            return None
+
+        unit, function_code = request[0], request[1]
+        if self.device_id != 255 and unit not in (self.device_id, 255):
+            return None
+
+        register = (request[2] << 8) | request[3]
+
+        if function_code == ModbusFunction.READ:
+            count = (request[4] << 8) | request[5]
+            if any(r not in self.registers for r in range(register, register + count)):
+                return self._exception(unit, function_code, ILLEGAL_DATA_ADDRESS)
+
+            payload = bytearray([unit, function_code, count * 2])
+            for r in range(register, register + count):
+                payload += self.registers[r].to_bytes(2, 'big')
+            return self._with_crc(payload)
+
+        if function_code == ModbusFunction.WRITE:
+            if register not in self.registers:
+                return self._exception(unit, function_code, ILLEGAL_DATA_ADDRESS)
+            self.registers[register] = (request[4] << 8) | request[5]
+            return bytes(request)
+
+        if function_code == ModbusFunction.WRITE_MULTIPLE:
+            count = (request[4] << 8) | request[5]
+            if len(request) != 9 + count * 2 or request[6] != count * 2:
+                return self._exception(unit, function_code, ILLEGAL_DATA_VALUE)
+            if any(r not in self.registers for r in range(register, register + count)):
+                return self._exception(unit, function_code, ILLEGAL_DATA_ADDRESS)
+
+            for i in range(count):
+                self.registers[register + i] = (request[7 + i * 2] << 8) | request[8 + i * 2]
+            return self._with_crc(bytearray(request[:6]))
+
+        return self._exception(unit, function_code, ILLEGAL_FUNCTION)
+
+    def _exception(self, unit: int, function_code: int, code: int) -> bytes:
+        """Build an exception response"""
+        return self._with_crc(bytearray([unit, function_code | 0x80, code]))
+
+    @staticmethod
+    def _with_crc(frame: bytearray) -> bytes:
+        """Append the Modbus CRC to a frame"""
+        return with_crc(frame)
+
+class SimulatedBLEDevice:
+    """Discovered device handle, mirrors bleak's BLEDevice"""
+
+    def __init__(self, address: str, name: str):
+        self.address = address
+        self.name = name
+        self.details = None
+
+class SimulatedAdvertisementData:
+    """Advertisement payload, mirrors bleak's AdvertisementData"""
+
+    def __init__(self, local_name: str, rssi: int):
+        self.local_name = local_name
+        self.rssi = rssi
+
+class SimulatedCharacteristic:
+    """GATT characteristic, mirrors bleak's BleakGATTCharacteristic"""
+
+    def __init__(self, uuid: str, handle: int, service_uuid: str):
+        self.uuid = uuid
+        self.handle = handle
+        self.service_uuid = service_uuid
+
+class SimulatedService:
+    """GATT service, mirrors bleak's BleakGATTService"""
+
+    def __init__(self, uuid: str, characteristics: List[SimulatedCharacteristic]):
+        self.uuid = uuid
+        self.characteristics = characteristics
+
+class SimulatedServiceCollection:
+    """GATT services of a peripheral, mirrors bleak's BleakGATTServiceCollection"""
+
+    def __init__(self, services: List[SimulatedService]):
+        self._services = services
+        self._by_handle = {char.handle: char for service in services for char in service.characteristics}
+
+    def __iter__(self):
+        return iter(self._services)
+
+    def get_characteristic(self, specifier) -> Optional[SimulatedCharacteristic]:
+        """Look up a characteristic by handle"""
+        return self._by_handle.get(specifier)
+
+class SimulatedClient:
+    """
+    Drop-in replacement for BleakClient talking to a SimulatedPeripheral
+    """
+
+    def __init__(self, peripheral: SimulatedPeripheral, disconnected_callback: Callable = None):
+        """
+        Initialize the client
+
+        Args:
+            peripheral: Peripheral to talk to
+            disconnected_callback: Called with the client when the link drops
+        """
+        self.peripheral = peripheral
+        self.disconnected_callback = disconnected_callback
+        self.is_connected = False
+        self.services = SimulatedServiceCollection([
+            SimulatedService(DEFAULT_NOTIFY_SERVICE_UUID, [
+                SimulatedCharacteristic(DEFAULT_NOTIFY_CHAR_UUID, NOTIFY_HANDLE, DEFAULT_NOTIFY_SERVICE_UUID)
+            ]),
+            SimulatedService(DEFAULT_WRITE_SERVICE_UUID, [
+                SimulatedCharacteristic(DEFAULT_WRITE_CHAR_UUID, WRITE_HANDLE, DEFAULT_WRITE_SERVICE_UUID)
+            ])
+        ])
+
+        self._notify_callback = None
+        self._notify_char = None
+        self._pending = {}  # key -> scheduled notification handle, removed once delivered
+        self._pending_keys = itertools.count()
+        self._busy_until = 0.0  # loop time the last queued response finishes sending
+
+    async def connect(self) -> bool:
+        """Connect to the peripheral"""
+        await asyncio.sleep(self.peripheral.latency)
+        self.is_connected = True
+        return True
+
+    async def disconnect(self) -> bool:
+        """Disconnect from the peripheral"""
+        self._drop_link(notify=False)
+        return True
+
+    async def start_notify(self, char_specifier, callback: Callable) -> None:
+        """Subscribe to notifications"""
+        self._require_connected()
+        char = char_specifier
+        if isinstance(char_specifier, int):
+            char = self.services.get_characteristic(char_specifier)
+        self._notify_char = char
+        self._notify_callback = callback
+
+    async def write_gatt_char(self, char_specifier, data, response: bool = False) -> None:
+        """Send a request to the peripheral"""
+        self._require_connected()
+
+        peripheral = self.peripheral
+        if random.random() < peripheral.disconnect_rate:
+            asyncio.get_event_loop().call_later(peripheral.latency, self._drop_link, True)
+            return
+
+        reply = peripheral.handle_request(bytes(data))
+        if reply is None:
+            return
+
+        loop = asyncio.get_event_loop()
+        chunks = range(0, len(reply), peripheral.mtu)
+
+        # Answer requests in order, like the device's UART bridge does
+        send_at = max(loop.time() + peripheral.latency + random.uniform(0, peripheral.jitter), self._busy_until)
+        self._busy_until = send_at + len(chunks) * FRAGMENT_SPACING
+
+        # Split the reply into MTU-sized notifications
+        for index, start in enumerate(chunks):
+            if random.random() < peripheral.drop_rate:
+                peripheral.dropped += 1
+                continue
+            key = next(self._pending_keys)
+            self._pending[key] = loop.call_at(send_at + index * FRAGMENT_SPACING,
+                                              self._notify, key, reply[start:start + peripheral.mtu])
+
+    def _notify(self, key: int, chunk: bytes) -> None:
+        """Deliver one notification, the way bleak does"""
+        self._pending.pop(key, None)
+        if not self.is_connected or not self._notify_callback:
+            return
+
+        self.peripheral.notifications += 1
+        result = self._notify_callback(self._notify_char, bytearray(chunk))
+        if asyncio.iscoroutine(result):
+            asyncio.ensure_future(result)
+
+    def _drop_link(self, notify: bool) -> None:
+        """Tear down the simulated link"""
+        for handle in self._pending.values():
+            handle.cancel()
+        self._pending.clear()
+
+        if not self.is_connected:
+            return
+
+        self.is_connected = False
+        if notify:
+            self.peripheral.disconnects += 1
+            logging.info(f"🤖 Simulated link drop: {self.peripheral.name}")
+            if self.disconnected_callback:
+                self.disconnected_callback(self)
+
+    def _require_connected(self) -> None:
+        if not self.is_connected:
+            raise ConnectionError("Not connected")
+
+class SimulatedScanner:
+    """
+    Drop-in replacement for BleakScanner that advertises simulated peripherals
+    """
+
+    def __init__(self, peripherals: Iterable[SimulatedPeripheral], detection_callback: Callable,
+                 interval: float = DEFAULT_ADVERTISE_INTERVAL):
+        self.peripherals = list(peripherals)
+        self.detection_callback = detection_callback
+        self.interval = interval
+        self._task = None
+
+    async def start(self) -> None:
+        """Start advertising"""
+        self._task = asyncio.create_task(self._advertise())
+
+    async def stop(self) -> None:
+        """Stop advertising"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _advertise(self) -> None:
+        while True:
+            for peripheral in self.peripherals:
+                rssi = peripheral.rssi + random.randint(-3, 3)
+                self.detection_callback(
+                    SimulatedBLEDevice(peripheral.address, peripheral.name),
+                    SimulatedAdvertisementData(peripheral.name, rssi)
+                )
+            await asyncio.sleep(self.interval)
+
+class SimulatedTransport:
+    """
+    Transport that replaces bleak with in-process simulated peripherals
+    """
+
+    name = 'simulator'
+
+    def __init__(self, peripherals: Iterable[SimulatedPeripheral]):
+        """
+        Initialize the transport
+
+        Args:
+            peripherals: Peripherals reachable through this transport
+        """
+        self.peripherals = {peripheral.address: peripheral for peripheral in peripherals}
+
+    def create_client(self, device, disconnected_callback=None, adapter: str = None) -> SimulatedClient:
+        """Create a client for a simulated device"""
+        peripheral = self.peripherals.get(device.address.upper())
+        if peripheral is None:
+            raise ConnectionError(f"No simulated peripheral at {device.address}")
+        return SimulatedClient(peripheral, disconnected_callback)
+
+    def create_scanner(self, detection_callback, adapter: str = None) -> SimulatedScanner:
+        """Create a scanner that sees every simulated peripheral"""
+        return SimulatedScanner(self.peripherals.values(), detection_callback)
+
+def create_simulated_transport(**overrides) -> SimulatedTransport:
+    """
+    Create a transport simulating the configured DCDC controller and battery
+
+    Args:
+        **overrides: Values replacing SIMULATOR_CONFIG entries
+
+    Returns:
+        SimulatedTransport: Transport with both devices
+    """
+    options = dict(SIMULATOR_CONFIG, **overrides)
+
+    return SimulatedTransport([
+        SimulatedPeripheral(DCDC_CONFIG['mac_addr'], DCDC_CONFIG['alias'], rover_registers(), **options),
+        SimulatedPeripheral(BATTERY_CONFIG['mac_addr'], BATTERY_CONFIG['alias'], battery_registers(),
+                            rssi=-70, **options)
+    ])
@@ -0,0 +1,171 @@
+"""
+Typed telemetry snapshots for Renogy devices
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+def _rounded(values: array, digits: int) -> List[float]:
+    """Convert a float array to a list, dropping single-precision noise"""
+    return [round(value, digits) for value in values]
+
+class Snapshot:
+    """
+    Latest values read from a device, one slot per field
+
+    Fields are None until parsed. Parsers replace arrays rather than changing
+    them in place, so copies can share them.
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        """Initialize an empty snapshot"""
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over the fields that have been parsed
+
+        Returns:
+            iterator of (field name, value)
+        """
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None:
+                yield name, value
+
+    def copy(self) -> 'Snapshot':
+        """
+        Copy the snapshot
+
+        Returns:
+            Snapshot: Shallow copy sharing the (never mutated) arrays
+        """
+        snapshot = self.__class__.__new__(self.__class__)
+        for name in self.__slots__:
+            setattr(snapshot, name, getattr(self, name))
+        return snapshot
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the wire format
+
+        Returns:
+            dict: Parsed fields only
+        """
+        return dict(self.items())
+
+class RoverSnapshot(Snapshot):
+    """
+    Rover/Wanderer/Adventurer controller values
+    """
+
+    __slots__ = (
+        'model', 'device_id', 'battery_type',
+        'battery_percentage', 'battery_voltage', 'battery_current', 'battery_temperature',
+        'controller_temperature', 'charging_status',
+        'load_status', 'load_voltage', 'load_current', 'load_power',
+        'pv_voltage', 'pv_current', 'pv_power',
+        'max_charging_power_today', 'max_discharging_power_today',
+        'charging_amp_hours_today', 'discharging_amp_hours_today',
+        'power_generation_today', 'power_consumption_today', 'power_generation_total'
+    )
+
+class BatterySnapshot(Snapshot):
+    """
+    LFP battery values, with per-cell voltages and per-sensor temperatures
+    held in fixed-length float arrays
+    """
+
+    __slots__ = (
+        'model', 'device_id',
+        'current', 'voltage', 'remaining_charge', 'capacity', 'soc_percent', 'power', 'status',
+        'cell_voltages', 'temperatures'
+    )
+
+    def __init__(self):
+        """Initialize an empty snapshot"""
+        super().__init__()
+        self.cell_voltages = array('f')
+        self.temperatures = array('f')
+
+    @property
+    def cell_count(self) -> int:
+        """Number of cells"""
+        return len(self.cell_voltages)
+
+    @property
+    def sensor_count(self) -> int:
+        """Number of temperature sensors"""
+        return len(self.temperatures)
+
+    @property
+    def min_cell_voltage(self) -> Optional[float]:
+        """Lowest cell voltage"""
+        return round(min(self.cell_voltages), 2) if self.cell_voltages else None
+
+    @property
+    def max_cell_voltage(self) -> Optional[float]:
+        """Highest cell voltage"""
+        return round(max(self.cell_voltages), 2) if self.cell_voltages else None
+
+    @property
+    def avg_cell_voltage(self) -> Optional[float]:
+        """Mean cell voltage"""
+        return round(sum(self.cell_voltages) / len(self.cell_voltages), 3) if self.cell_voltages else None
+
+    @property
+    def cell_voltage_diff(self) -> Optional[float]:
+        """Spread between the highest and lowest cell"""
+        return round(max(self.cell_voltages) - min(self.cell_voltages), 2) if self.cell_voltages else None
+
+    @property
+    def min_temperature(self) -> Optional[float]:
+        """Lowest sensor temperature"""
+        return round(min(self.temperatures), 1) if self.temperatures else None
+
+    @property
+    def max_temperature(self) -> Optional[float]:
+        """Highest sensor temperature"""
+        return round(max(self.temperatures), 1) if self.temperatures else None
+
+    @property
+    def avg_temperature(self) -> Optional[float]:
+        """Mean sensor temperature"""
+        return round(sum(self.temperatures) / len(self.temperatures), 1) if self.temperatures else None
+
+    def cell_voltage_list(self) -> List[float]:
+        """Cell voltages as a plain list, index = cell number"""
+        return _rounded(self.cell_voltages, 2)
+
+    def temperature_list(self) -> List[float]:
+        """Sensor temperatures as a plain list, index = sensor number"""
+        return _rounded(self.temperatures, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the wire format
+
+        Returns:
+            dict: Parsed fields, arrays as lists, plus cell and temperature statistics
+        """
+        data = {name: value for name, value in self.items() if name not in ('cell_voltages', 'temperatures')}
+        data['cell_count'] = self.cell_count
+        data['cell_voltages'] = self.cell_voltage_list()
+        data['sensor_count'] = self.sensor_count
+        data['temperatures'] = self.temperature_list()
+
+        if self.cell_voltages:
+            data['min_cell_voltage'] = self.min_cell_voltage
+            data['max_cell_voltage'] = self.max_cell_voltage
+            data['avg_cell_voltage'] = self.avg_cell_voltage
+            data['cell_voltage_diff'] = self.cell_voltage_diff
+
+        if self.temperatures:
+            data['min_temperature'] = self.min_temperature
+            data['max_temperature'] = self.max_temperature
+            data['avg_temperature'] = self.avg_temperature
+
+        return data
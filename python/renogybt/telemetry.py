@@ -0,0 +1,178 @@
+"""
+Link-quality telemetry for Renogy BLE connections
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+# Upper bounds of the round-trip time buckets, in seconds
+RTT_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0, 5.0)
+
+class RttHistogram:
+    """
+    Fixed-bucket histogram of Modbus round-trip times
+    """
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, bounds=RTT_BUCKETS):
+        """
+        Initialize the histogram
+
+        Args:
+            bounds: Ascending bucket upper bounds in seconds
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last bucket catches everything slower
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Record a round-trip time
+
+        Args:
+            seconds: Round-trip time in seconds
+        """
+        index = 0
+        for bound in self.bounds:
+            if seconds <= bound:
+                break
+            index += 1
+
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Estimate a percentile as the upper bound of the bucket it falls in,
+        capped at the largest value recorded
+
+        Args:
+            fraction: Percentile as a fraction (e.g. 0.95)
+
+        Returns:
+            float seconds, or None if nothing has been recorded
+        """
+        if not self.count:
+            return None
+
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the histogram as plain data
+
+        Returns:
+            dict: Buckets, count, mean, p50, p95 and max in milliseconds
+        """
+        buckets = {f'le_{int(bound * 1000)}ms': count for bound, count in zip(self.bounds, self.counts)}
+        buckets['inf'] = self.counts[-1]
+
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            'buckets': buckets,
+            'count': self.count,
+            'mean_ms': ms(self.total / self.count) if self.count else None,
+            'p50_ms': ms(self.percentile(0.5)),
+            'p95_ms': ms(self.percentile(0.95)),
+            'max_ms': ms(self.max) if self.count else None
+        }
+
+class LinkStats:
+    """
+    Counters and samples describing the quality of one BLE link
+    """
+
+    def __init__(self):
+        """Initialize empty telemetry"""
+        self.rssi = None
+        self.rssi_at = None
+        self.rtt = RttHistogram()
+        self.requests = 0
+        self.write_failures = 0
+        self.timeouts = 0
+        self.modbus_errors = 0
+        self.late_frames = 0
+        self.unmatched_frames = 0
+        self.connects = 0
+        self.reconnects = 0
+
+    def record_rssi(self, rssi: Optional[int], seen_at: float = None) -> None:
+        """
+        Record an RSSI sample
+
+        Args:
+            rssi: Signal strength in dBm
+            seen_at: Wall-clock time of the sample (default: now)
+        """
+        if rssi is not None:
+            self.rssi = rssi
+            self.rssi_at = seen_at if seen_at is not None else time.time()
+
+    def record_rtt(self, seconds: float) -> None:
+        """A request completed after the given round-trip time"""
+        self.requests += 1
+        self.rtt.observe(seconds)
+
+    def record_timeout(self) -> None:
+        """A request got no response in time"""
+        self.requests += 1
+        self.timeouts += 1
+
+    def record_modbus_error(self) -> None:
+        """A request got a Modbus exception response"""
+        self.requests += 1
+        self.modbus_errors += 1
+
+    def record_late_frame(self) -> None:
+        """A response arrived for a request that had already timed out"""
+        self.late_frames += 1
+
+    def record_unmatched_frame(self) -> None:
+        """A response matched no outstanding or recent request"""
+        self.unmatched_frames += 1
+
+    def record_write_failure(self) -> None:
+        """A GATT write failed"""
+        self.write_failures += 1
+
+    def record_connect(self) -> None:
+        """A connection was established"""
+        if self.connects:
+            self.reconnects += 1
+        self.connects += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the telemetry as plain data
+
+        Returns:
+            dict: Samples, counters, error rates and the RTT histogram
+        """
+        return {
+            'rssi': self.rssi,
+            'rssi_at': self.rssi_at,
+            'requests': self.requests,
+            'write_failures': self.write_failures,
+            'timeouts': self.timeouts,
+            'modbus_errors': self.modbus_errors,
+            'timeout_rate': round(self.timeouts / self.requests, 3) if self.requests else 0,
+            'late_frames': self.late_frames,
+            'unmatched_frames': self.unmatched_frames,
+            'connects': self.connects,
+            'reconnects': self.reconnects,
+            'rtt': self.rtt.to_dict()
+        }
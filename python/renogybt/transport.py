@@ -0,0 +1,81 @@
+"""
+Pluggable BLE transport so connections can run on real hardware or a simulator
+"""
+
+import logging
+
+from bleak import BleakClient, BleakScanner
+
+from config.settings import RENOGY_TRANSPORT
+
+class BleakTransport:
+    """
+    Transport backed by bleak and the system Bluetooth stack
+    """
+
+    name = 'bleak'
+
+    def create_client(self, device, disconnected_callback=None, adapter: str = None):
+        """
+        Create a client for a discovered device
+
+        Args:
+            device: Device returned by a scanner
+            disconnected_callback: Called with the client when the link drops
+            adapter: Bluetooth adapter name (default: system default)
+
+        Returns:
+            BleakClient-compatible client
+        """
+        return BleakClient(
+            device,
+            disconnected_callback=disconnected_callback,
+            bluez={'adapter': adapter} if adapter else {}
+        )
+
+    def create_scanner(self, detection_callback, adapter: str = None):
+        """
+        Create a scanner that reports advertisements
+
+        Args:
+            detection_callback: Called with (device, advertisement_data)
+            adapter: Bluetooth adapter name (default: system default)
+
+        Returns:
+            BleakScanner-compatible scanner
+        """
+        return BleakScanner(
+            detection_callback=detection_callback,
+            bluez={'adapter': adapter} if adapter else {}
+        )
+
+# Active transport
+_transport = None
+
+def get_transport():
+    """
+    Get the active transport, creating the configured one on first use
+
+    Returns:
+        Transport used for all new clients and scanners
+    """
+    global _transport
+    if _transport is None:
+        if RENOGY_TRANSPORT == 'simulator':
+            from .simulator import create_simulated_transport
+            _transport = create_simulated_transport()
+        else:
+            _transport = BleakTransport()
+        logging.info(f"🚌 Using {_transport.name} BLE transport")
+    return _transport
+
+def set_transport(transport) -> None:
+    """
+    Replace the active transport, before any connections are created
+
+    Args:
+        transport: Transport providing create_client and create_scanner
+    """
+    global _transport
+    _transport = transport
+    logging.info(f"🚌 Using {transport.name} BLE transport")
@@ -78,7 +78,9 @@ def crc16_modbus(data):
 class ModbusFunction:
     READ = 3
     WRITE = 6
+    WRITE_MULTIPLE = 16
     ERROR = 131
+    WRITE_MULTIPLE_ERROR = 144
 
 # Common device state mappings
 BATTERY_TYPES = {
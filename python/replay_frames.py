@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Replay captured Renogy BLE traffic through the parsers, change detection and LipoModel.
+Captures come from test_renogy_simple.py --record or RENOGY_FRAME_CAPTURE in the settings.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from renogybt import RoverDevice, BatteryDevice, LipoModel
+from renogybt.frame_log import FrameReplayer
+
+# Configure logging
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+log = logging.getLogger(__name__)
+
+class ReplayRunner:
+    """Drives captured traffic through devices and combines their data like RenogyService"""
+
+    def __init__(self):
+        """Initialize the runner"""
+        self.lipo_model = LipoModel()
+        self.data = {}
+        self.callbacks = 0
+        self.combined = None
+        self.model_time = 0.0
+
+    async def on_device_data(self, device_key, data, changed):
+        """Store device data and run the LipoModel once both devices have reported"""
+        self.callbacks += 1
+        self.data[device_key] = data
+
+        if 'dcdc' in self.data and 'battery' in self.data:
+            started = time.perf_counter()
+            self.combined = self.lipo_model.calculate(self.data['dcdc'], self.data['battery'])
+            json.dumps(self.combined)  # what emitting to the socket costs
+            self.model_time += time.perf_counter() - started
+
+    async def replay(self, device_key, device, path, realtime, speed):
+        """Replay one capture through its device"""
+        async def on_data(_device, data, changed):
+            await self.on_device_data(device_key, data, changed)
+
+        device.on_data_callback = on_data
+        stats = await FrameReplayer(device).run(path, realtime, speed)
+        print(f"{device_key}: {json.dumps(stats)}")
+        print(f"{device_key} link: {json.dumps(device.get_link_stats()['changes'])}")
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Replay captured Renogy traffic')
+    parser.add_argument('--dcdc', metavar='FILE', help='Capture from the DCDC controller')
+    parser.add_argument('--battery', metavar='FILE', help='Capture from the Battery')
+    parser.add_argument('--realtime', action='store_true',
+                        help='Keep the recorded timing instead of replaying as fast as possible')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Playback speed multiplier with --realtime (default: 1)')
+    parser.add_argument('--show', action='store_true', help='Print the last combined data')
+    return parser.parse_args()
+
+async def main():
+    """Main entry point"""
+    args = parse_args()
+    if not args.dcdc and not args.battery:
+        log.error("Nothing to replay, pass --dcdc and/or --battery")
+        return
+
+    runner = ReplayRunner()
+    replays = []
+
+    if args.dcdc:
+        device = RoverDevice(mac_address='00:00:00:00:00:01', name='replay-dcdc')
+        replays.append(runner.replay('dcdc', device, args.dcdc, args.realtime, args.speed))
+    if args.battery:
+        device = BatteryDevice(mac_address='00:00:00:00:00:02', name='replay-battery')
+        replays.append(runner.replay('battery', device, args.battery, args.realtime, args.speed))
+
+    started = time.perf_counter()
+    await asyncio.gather(*replays)
+    elapsed = time.perf_counter() - started
+
+    print(f"data callbacks: {runner.callbacks}, total {elapsed * 1000:.1f} ms, "
+          f"LipoModel + JSON {runner.model_time * 1000:.1f} ms")
+    if args.show and runner.combined:
+        print(json.dumps(runner.combined, indent=2, sort_keys=True))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,11 +4,13 @@ Service for handling Renogy device connections and data retrieval using the simp
 import logging
 import asyncio
 import datetime
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, List, Optional, Set
 
 # Import from the simplified library
 from renogybt import DeviceManager, RoverDevice, BatteryDevice, LipoModel
-from config.settings import DCDC_CONFIG, BATTERY_CONFIG, POLL_INTERVAL, TEMPERATURE_UNIT
+from config.settings import (DCDC_CONFIG, BATTERY_CONFIG, POLL_INTERVAL, TEMPERATURE_UNIT, LINK_STATS_INTERVAL,
+                             RENOGY_FRAME_CAPTURE, FRAME_CAPTURE_DIR)
 from controllers.socketio_controller import emit_event
 
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +34,8 @@ class RenogyService:
             'combined': None
         }
 
+        self.data_changed = False  # set when device data arrives, cleared once emitted
+
         self.running = False
         self.update_task = None
         self.initialized = False
@@ -49,20 +53,30 @@ class RenogyService:
             dcdc_device = RoverDevice(
                 mac_address=DCDC_CONFIG['mac_addr'],
                 name=DCDC_CONFIG['alias'],
-                device_id=DCDC_CONFIG['device_id']
+                device_id=DCDC_CONFIG['device_id'],
+                adapter=DCDC_CONFIG['adapter'],
+                max_in_flight=DCDC_CONFIG['max_in_flight']
             )
 
             # Create the Battery device
             battery_device = BatteryDevice(
                 mac_address=BATTERY_CONFIG['mac_addr'],
                 name=BATTERY_CONFIG['alias'],
-                device_id=BATTERY_CONFIG['device_id']
+                device_id=BATTERY_CONFIG['device_id'],
+                adapter=BATTERY_CONFIG['adapter'],
+                max_in_flight=BATTERY_CONFIG['max_in_flight']
             )
 
             # Add devices to manager
             await self.device_manager.add_device('dcdc', dcdc_device)
             await self.device_manager.add_device('battery', battery_device)
 
+            # Capture raw traffic for offline replay
+            if RENOGY_FRAME_CAPTURE:
+                started = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+                for device_key, device in self.device_manager.devices.items():
+                    device.connection.start_recording(os.path.join(FRAME_CAPTURE_DIR, f'{device_key}-{started}.rlog'))
+
             # Register event handlers
             self.device_manager.add_data_handler(self.on_device_data)
             self.device_manager.add_error_handler(self.on_device_error)
@@ -94,38 +108,53 @@ class RenogyService:
                 self.running = False
                 return
 
-            # Connect to all devices with retries
+            # Connect to all devices concurrently, polling each as soon as its first attempts finish
             log.info("🔌 Connecting to all devices...")
             max_attempts = 3
 
-            if await self.device_manager.connect_all_devices(max_attempts):
-                log.info("✅ Successfully connected to all devices")
-
-                # Start polling for connected devices
-                log.info("📊 Starting sequential polling...")
-                await self.device_manager.start_polling()
+            results = await self.device_manager.connect_devices(
+                max_attempts,
+                on_result=self._on_device_connected
+            )
 
-                # Create update loop task for data processing
-                self.update_task = asyncio.create_task(self._update_loop())
+            # Create update loop task for data processing, devices that are still down join it once they reconnect
+            self.update_task = asyncio.create_task(self._update_loop())
 
+            if all(results.values()):
                 log.info("✅ Renogy service started")
             else:
-                log.error("❌ Failed to connect to all devices, not starting update loop")
-                self.running = False
+                failed = ', '.join(key for key, connected in results.items() if not connected)
+                log.warning(f"⚠️ Renogy service started, still reconnecting: {failed}")
         except Exception as e:
             log.error(f"❌ Error starting Renogy service: {e}")
             self.running = False
 
+    async def _on_device_connected(self, device_key: str, device: Any, connected: bool) -> None:
+        """Start polling a device once its first connection attempts finish, the polling loop retries if they failed"""
+        log.info(f"📊 Starting polling for {device_key}" + ("" if connected else " (reconnecting in background)"))
+        await device.start_polling()
+
     async def _update_loop(self):
         """Periodically update the model and emit data"""
+        last_link_stats = 0
+
         while self.running:
             try:
+                # Emit link telemetry at a slower rate than the data
+                now = asyncio.get_event_loop().time()
+                if now - last_link_stats >= LINK_STATS_INTERVAL:
+                    last_link_stats = now
+                    await emit_event('renogy', 'link_stats', self.get_link_stats(), update_state=False)
+
                 # Check if devices are still connected
                 dcdc_connected = self.device_manager.is_device_connected('dcdc')
                 battery_connected = self.device_manager.is_device_connected('battery')
 
-                # Only update if both devices are connected and we have data
-                if dcdc_connected and battery_connected and self.data['dcdc'] and self.data['battery']:
+                # Only update if both devices are connected and we have new data
+                if (dcdc_connected and battery_connected and self.data['dcdc'] and self.data['battery']
+                        and self.data_changed):
+                    self.data_changed = False
+
                     # Use the LipoModel to combine data and calculate time estimates
                     combined_data = self.lipo_model.calculate(self.data['dcdc'], self.data['battery'])
 
@@ -167,13 +196,15 @@ class RenogyService:
 
         log.info("⏹️ Renogy service stopped")
 
-    async def on_device_data(self, device_key: str, device: Any, data: Dict[str, Any]) -> None:
-        """Handle data from devices"""
-        log.info(f"📥 Received data from {device_key} device: {data}")
+    async def on_device_data(self, device_key: str, device: Any, data: Dict[str, Any], changed: Set[str]) -> None:
+        """Handle data from devices, called only when fields move past their deadband or on a heartbeat"""
+        log.debug(f"📥 {device_key} changed: {', '.join(sorted(changed))}")
         if device_key == 'dcdc':
             self.data['dcdc'] = data
+            self.data_changed = True
         elif device_key == 'battery':
             self.data['battery'] = data
+            self.data_changed = True
 
     async def on_device_error(self, device_key: str, device: Any, error: str) -> None:
         """Handle device errors"""
@@ -187,13 +218,61 @@ class RenogyService:
             'code': 'CONNECTION_LOST' if 'connection loss' in str(error) else 'DEVICE_ERROR'
         })
 
+    async def refresh(self, device_key: str, fields: Optional[List[str]] = None,
+                      max_age: float = 0.0) -> Dict[str, Any]:
+        """
+        Read fields from one device now, for screens that need fresh values
+
+        The refreshed device data is also queued for the next data_update emit.
+
+        Args:
+            device_key: 'dcdc' or 'battery'
+            fields: Data fields wanted (default: all)
+            max_age: Seconds old cached values may be and still be returned
+
+        Returns:
+            dict: The requested fields
+
+        Raises:
+            ValueError: If the device or a field is unknown
+        """
+        device = self.device_manager.get_device(device_key)
+        if device is None:
+            raise ValueError(f"Unknown device: {device_key}")
+
+        values = await device.refresh(fields, max_age)
+
+        if self.data.get(device_key) is not None:
+            self.data[device_key] = device.data.copy()
+            self.data_changed = True
+
+        return values
+
     def get_latest_data(self) -> Optional[Dict[str, Any]]:
         """Get latest combined data"""
         return self.data.get('combined')
 
-    def get_device_status(self) -> Dict[str, bool]:
+    def get_device_status(self) -> Dict[str, Any]:
         """Get status of all devices"""
-        return {
+        status = {
             'dcdc_connected': self.device_manager.is_device_connected('dcdc'),
             'battery_connected': self.device_manager.is_device_connected('battery')
+        }
+
+        # Include the link state machine and link telemetry for each device
+        for device_key in ('dcdc', 'battery'):
+            device = self.device_manager.get_device(device_key)
+            if device:
+                status[f'{device_key}_link'] = device.connection.link.get_status()
+                status[f'{device_key}_link_stats'] = device.get_link_stats()
+
+        status['handlers'] = self.device_manager.get_handler_stats()
+        status['handler_queue'] = self.device_manager.get_event_queue_stats()
+        return status
+
+    def get_link_stats(self) -> Dict[str, Any]:
+        """Get link-quality telemetry for all devices"""
+        return {
+            device_key: device.get_link_stats()
+            for device_key, device in self.device_manager.devices.items()
         }
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Regression tests for matching Modbus responses to outstanding reads, run against
+a device whose writes go nowhere so every response is delivered by hand.
+"""
+
+import asyncio
+
+from renogybt import BatteryDevice
+from renogybt.codec import read_command, with_crc
+from renogybt.exceptions import TransactionTimeoutError
+from renogybt.simulator import SimulatedPeripheral, battery_registers
+from renogybt.utils import ModbusFunction
+
+DEVICE_ID = 255
+
+def offline_battery():
+    """Battery device that accepts every write without sending it anywhere"""
+    device = BatteryDevice('00:00:00:00:00:01', 'test', DEVICE_ID)
+    device.connection.is_connected = True
+
+    async def write(data, max_retries=2):
+        return True
+
+    device.connection.write = write
+    return device
+
+def test_late_exception_reply_does_not_fail_live_merged_read():
+    async def scenario():
+        device = offline_battery()
+        plan = device.get_read_plan()
+        merged = next(planned for planned in plan if planned.merged)
+
+        # A one-word read gives up before the device answers
+        try:
+            await device.transact(5223, 1, timeout=0.01)
+            assert False, "read should have timed out"
+        except TransactionTimeoutError:
+            pass
+
+        # A merged read of another size goes out, then the timed-out read's exception reply arrives
+        read = asyncio.ensure_future(device._read_sections(merged))
+        await asyncio.sleep(0.01)
+        await device._on_data_received(bytearray(with_crc(bytes((DEVICE_ID, ModbusFunction.ERROR, 0x02)))))
+        await asyncio.sleep(0.01)
+
+        assert not read.done()
+        assert device.connection.stats.to_dict()['late_frames'] == 1
+
+        # The merged read still completes with its own response and stays merged
+        peripheral = SimulatedPeripheral('00:00:00:00:00:01', 'test', battery_registers())
+        response = peripheral.handle_request(read_command(DEVICE_ID, merged.register, merged.words))
+        await device._on_data_received(bytearray(response))
+
+        assert await read
+        assert merged in device.get_read_plan()
+
+    asyncio.run(scenario())
@@ -8,9 +8,12 @@ import asyncio
 import logging
 import argparse
 import json
+import os
 from typing import Dict, Any
 
 from renogybt import DeviceManager, RoverDevice, BatteryDevice
+from renogybt.transport import set_transport
+from renogybt.simulator import create_simulated_transport
 from config.settings import DCDC_CONFIG, BATTERY_CONFIG
 
 # Configure logging
@@ -36,7 +39,9 @@ class RenogyTester:
             dcdc_device = RoverDevice(
                 mac_address=DCDC_CONFIG['mac_addr'],
                 name=DCDC_CONFIG['alias'],
-                device_id=DCDC_CONFIG['device_id']
+                device_id=DCDC_CONFIG['device_id'],
+                adapter=DCDC_CONFIG['adapter'],
+                max_in_flight=DCDC_CONFIG['max_in_flight']
             )
             await self.device_manager.add_device('dcdc', dcdc_device)
             log.info(f"Added DCDC device: {DCDC_CONFIG['alias']}")
@@ -45,7 +50,9 @@ class RenogyTester:
             battery_device = BatteryDevice(
                 mac_address=BATTERY_CONFIG['mac_addr'],
                 name=BATTERY_CONFIG['alias'],
-                device_id=BATTERY_CONFIG['device_id']
+                device_id=BATTERY_CONFIG['device_id'],
+                adapter=BATTERY_CONFIG['adapter'],
+                max_in_flight=BATTERY_CONFIG['max_in_flight']
             )
             await self.device_manager.add_device('battery', battery_device)
             log.info(f"Added Battery device: {BATTERY_CONFIG['alias']}")
@@ -88,10 +95,10 @@ class RenogyTester:
             log.info("Stopping all devices...")
             await self.device_manager.stop()
 
-    async def on_device_data(self, device_key, device, data):
+    async def on_device_data(self, device_key, device, data, changed):
         """Handle device data updates"""
-        self.data[device_key] = data.copy()
-        log.debug(f"Received data from {device_key}")
+        self.data[device_key] = data.to_dict()
+        log.debug(f"Received data from {device_key}, changed: {sorted(changed)}")
 
     async def on_device_error(self, device_key, device, error):
         """Handle device errors"""
@@ -143,6 +150,16 @@ def parse_args():
                         help='Test only the DCDC controller')
     parser.add_argument('--battery-only', action='store_true',
                         help='Test only the Battery')
+    parser.add_argument('--simulate', action='store_true',
+                        help='Use simulated devices instead of Bluetooth hardware')
+    parser.add_argument('--mtu', type=int, default=20,
+                        help='Simulated notification size in bytes (default: 20)')
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help='Simulated probability of losing a notification (default: 0)')
+    parser.add_argument('--disconnect-rate', type=float, default=0.0,
+                        help='Simulated probability of a request dropping the link (default: 0)')
+    parser.add_argument('--record', metavar='DIR',
+                        help='Capture raw traffic to DIR/<device>.rlog for replay_frames.py')
     return parser.parse_args()
 
 async def main():
@@ -157,9 +174,22 @@ async def main():
     else:
         device_types = ['dcdc', 'battery']
 
+    # Swap Bluetooth for in-process simulated devices
+    if args.simulate:
+        set_transport(create_simulated_transport(
+            mtu=args.mtu,
+            drop_rate=args.drop_rate,
+            disconnect_rate=args.disconnect_rate
+        ))
+
     # Create and run tester
     tester = RenogyTester(device_types)
     await tester.setup()
+
+    if args.record:
+        for device_key, device in tester.device_manager.devices.items():
+            device.connection.start_recording(os.path.join(args.record, f'{device_key}.rlog'))
+
     await tester.run_test(args.duration)
 
 if __name__ == "__main__":